@@ -3,25 +3,137 @@
 # Primary Algorithms Used - Divide and Conquer, Dynamic Programming
 # Extra Credit - Greedy Algorithm (I completed the extra credit)
 
-import random
-import string
-import copy
+# Only cheap built-in modules are imported here so that "import + solve one puzzle" stays fast:
+# random is imported where puzzles are shuffled, and features that need numpy/pandas/matplotlib
+# live in other modules (see _LAZY below)
 import math
+import time
 
 # Get what symbols are in the domain given an NxN sudoku puzzle
 # ex. 16x16 Domain={1,2,3,4,5,6,7,8,9,A,B,C,D,E,F,G}
+# Past 35 symbols the letters run out, so larger grids use the numbers 1..N as tokens
+# ex. 36x36 Domain={1,2,...,35,36}
 def get_symbols(N):
+    if N > 35:
+        return [str(i) for i in range(1, N + 1)]
     digits = [str(i) for i in range(1, min(N, 9) + 1)]
     if N > 9:
         letters = [chr(ord('A') + i) for i in range(N - 9)]
         return digits + letters
     return digits
 
+# Translates puzzle cells between external tokens and the solver's internal symbol indices
+# Internally every cell is an int: 0 is blank and k (1..N) is the k-th symbol
+class SymbolCodec:
+    def __init__(self, N, symbols=None, blank='0'):
+        self.N = N
+        self.symbols = list(symbols) if symbols is not None else get_symbols(N)
+        self.blank = blank
+        if len(self.symbols) != N or len(set(self.symbols)) != N or blank in self.symbols:
+            raise ValueError(f"Need {N} distinct symbols different from the blank '{blank}'")
+        self.index = {sym: k for k, sym in enumerate(self.symbols, 1)}
+        self.index[blank] = 0
+        self.tokens = [blank] + self.symbols
+
+    # External grid -> NxN list of ints
+    def encode(self, S):
+        try:
+            return [[self.index[x] for x in row] for row in S]
+        except KeyError as e:
+            raise ValueError(f"'{e.args[0]}' is not a valid symbol for N={self.N}") from None
+
+    # NxN list of ints -> external grid
+    def decode(self, g):
+        tokens = self.tokens
+        return [[tokens[v] for v in row] for row in g]
+
+# Codec for puzzles that are already given as integer lists (0 = blank, 1..N)
+class IntCodec(SymbolCodec):
+    def __init__(self, N):
+        super().__init__(N, symbols=range(1, N + 1), blank=0)
+
+    def encode(self, S):
+        for row in S:
+            for x in row:
+                if not 0 <= x <= self.N:
+                    raise ValueError(f"'{x}' is not a valid symbol for N={self.N}")
+        return [list(row) for row in S]
+
+    def decode(self, g):
+        return [list(row) for row in g]
+
+# Pick the codec for puzzle S: integer lists stay integers, anything else uses get_symbols(N)
+# Default codecs are built once per N and shared
+_codecs = {}
+
+def get_codec(N, S=None):
+    key = (N, bool(S) and bool(S[0]) and isinstance(S[0][0], int))
+    if key not in _codecs:
+        _codecs[key] = IntCodec(N) if key[1] else SymbolCodec(N)
+    return _codecs[key]
+
+# Lookup tables for an NxN grid, built on first use and reused for every puzzle of that size
+# box_id[i][j] -> which box cell (i,j) is in, box_cells[k] -> the cells of box k
+_tables = {}
+
+def get_tables(N):
+    if N not in _tables:
+        b = int(N**0.5)
+        box_id = tuple(tuple((i//b)*b + j//b for j in range(N)) for i in range(N))
+        box_cells = tuple(tuple((i, j) for i in range(br, br+b) for j in range(bc, bc+b))
+                          for br in range(0, N, b) for bc in range(0, N, b))
+        _tables[N] = (box_id, box_cells)
+    return _tables[N]
+
+# Same lookups over flat cell numbers (cell = i*N + j), also built once per N
+# units[u] -> the cells of row u (u < N), column u-N (u < 2N) or box u-2N,
+# unit_of[cell] -> its (row, column, box) units
+# Peers are walked through these two (O(N^2) entries) rather than kept as a per-cell peer list,
+# which would be O(N^3) and stay cached for the life of the process
+_units = {}
+
+def get_units(N):
+    if N not in _units:
+        box_id, box_cells = get_tables(N)
+        # Every unit refers to the same int objects for its cells instead of its own copies
+        cell = tuple(range(N*N))
+        units = (tuple(tuple(cell[i*N + j] for j in range(N)) for i in range(N))
+                 + tuple(tuple(cell[i*N + j] for i in range(N)) for j in range(N))
+                 + tuple(tuple(cell[i*N + j] for i, j in box) for box in box_cells))
+        unit_of = tuple((i, N + j, 2*N + box_id[i][j]) for i in range(N) for j in range(N))
+        _units[N] = (units, unit_of)
+    return _units[N]
+
+# Zobrist keys for an NxN grid, built once per N from a fixed seed
+# keys[u][v] is a random 64-bit key for value v in unit u (row u, column u-N, box u-2N, as in
+# get_units). Filling or emptying (i,j) with v XORs the keys of its row, column and box.
+# Only these 3N*(N+1) keys are stored, not one combined key per (cell, value).
+_zobrist = {}
+
+def get_zobrist(N):
+    if N not in _zobrist:
+        import random
+        rng = random.Random(N)
+        _zobrist[N] = tuple(tuple(rng.getrandbits(64) for _ in range(N + 1)) for _ in range(3*N))
+    return _zobrist[N]
+
+# Number of cells to blank out of a full grid for difficulty 0-2
+def count_blanks(total, difficulty):
+    if difficulty == 0:
+        return total // 4 # 25% removed
+    elif difficulty == 1:
+        return total // 3 # 33% removed
+    else:
+        return total // 2 # 50% removed
+
 # Generate an NxN puzzle of difficulty 0-2 (‘0’ is easy, ‘1’ is medium, and ‘2’ is hard)
-def generate_puzzle(N, difficulty):
+# Cells come out as get_symbols(N) tokens unless another codec is given (ex. IntCodec(N))
+def generate_puzzle(N, difficulty, codec=None):
+    import random
+    if codec is None:
+        codec = get_codec(N)
     # Generate valide full NxN sudoku solution
     block = int(N**0.5)
-    symbols = get_symbols(N)
     # Base pattern fill
     base = [[None]*N for _ in range(N)]
     for r in range(N):
@@ -41,45 +153,53 @@ def generate_puzzle(N, difficulty):
     row_map = shuffle_band(list(range(N)), block)
     # Shuffle column indices similarly
     col_map = shuffle_band(list(range(N)), block)
-    # Symbol permutation
-    perm = symbols[:]
+    # Symbol permutation (symbol indices 1..N)
+    perm = list(range(1, N + 1))
     random.shuffle(perm)
     # Build shuffled full solution
-    full = [['0']*N for _ in range(N)]
+    puzzle = [[0]*N for _ in range(N)]
     for r in range(N):
         for c in range(N):
             orig_idx = base[row_map[r]][col_map[c]]
-            full[r][c] = perm[orig_idx]
+            puzzle[r][c] = perm[orig_idx]
     # Remove pieces of solution (set to 0)
     total = N*N
-    if difficulty == 0:
-        blanks = total // 4 # 25% removed
-    elif difficulty == 1:
-        blanks = total // 3 # 33% removed
-    else:
-        blanks = total // 2 # 50% removed
+    blanks = count_blanks(total, difficulty)
     positions = list(range(total))
     random.shuffle(positions)
-    puzzle = copy.deepcopy(full)
     for pos in positions[:blanks]:
         r, c = divmod(pos, N)
-        puzzle[r][c] = '0'
-    return puzzle
+        puzzle[r][c] = 0
+    return codec.decode(puzzle)
 
 # Solves NxN sudoku puzzle (S) using strategy C
-def BB_advancedsudoku4(S, N, C):
-    symbols = get_symbols(N)
-    grid = copy.deepcopy(S)
-    b = int(N**0.5)
+# time_limit caps the run time (seconds) of the local search ('mc') and SAT ('sat') strategies
+# stats (optional dict) is filled with details about how the strategy went
+# codec translates S to/from symbol indices (default: get_codec(N, S))
+# verbose=False silences progress messages (ex. when greedy gets stuck)
+# trace (optional, ex. sudoku_trace.SearchTrace) records every step of the dac search
+# nogood_size is the largest nogood the backjumping strategy ('cbj') remembers (0 = none)
+# tt_size > 0 gives the dac search (also inside dp) a table of up to tt_size proven dead ends;
+# hit counts go to stats (ignored when tracing)
+def BB_advancedsudoku4(S, N, C, time_limit=10.0, stats=None, codec=None, verbose=True, trace=None,
+                       nogood_size=3, tt_size=0):
+    if stats is None:
+        stats = {}
+    if codec is None:
+        codec = get_codec(N, S)
+    # Strategies work on symbol indices: 0 is blank, 1..N are the symbols
+    symbols = list(range(1, N + 1))
+    grid = codec.encode(S)
+    box_id, box_cells = get_tables(N)
     
     full_mask = (1 << N) - 1
-    sym2bit = {sym: 1 << idx for idx, sym in enumerate(symbols)}
-    bit2sym = {1 << idx: sym for idx, sym in enumerate(symbols)}
+    sym2bit = {sym: 1 << (sym - 1) for sym in symbols}
+    bit2sym = {1 << (sym - 1): sym for sym in symbols}
 
     def find_empty(g):
         for i in range(N):
             for j in range(N):
-                if g[i][j] == '0':
+                if g[i][j] == 0:
                     return i, j
         return None
 
@@ -87,17 +207,102 @@ def BB_advancedsudoku4(S, N, C):
     def greedy(g):
         for i in range(N):
             for j in range(N):
-                if g[i][j] == '0':
+                if g[i][j] == 0:
                     for val in symbols:
                         if is_valid(g, i, j, val):
                             g[i][j] = val
                             break
                     # If no solution can be found based on previous decisions -> get stuck (greedy = no backtracking - pick a path and commit)
-                    if g[i][j] == '0':
-                        print(f"Greedy stuck at cell ({i},{j})")
+                    if g[i][j] == 0:
+                        if verbose:
+                            print(f"Greedy stuck at cell ({i},{j})")
                         return g, False
         return g, True
 
+    # Greedy with lookahead, still no backtracking
+    # Always fills the cell with the fewest candidates left, with the value that takes a candidate
+    # away from the fewest open peers, skipping values that would leave a peer without candidates
+    # or a row/column/box with nowhere to put that value. Candidate masks, candidate counts and
+    # per-unit place counts are updated incrementally, so each fill is O(N) on top of the choice.
+    def lookahead(g):
+        units, unit_of = get_units(N)
+        flat = [v for row in g for v in row]
+        used = [0]*(3*N)                               # symbols already placed in each unit
+        for c, v in enumerate(flat):
+            if v:
+                for u in unit_of[c]:
+                    used[u] |= 1 << (v - 1)
+        cand = [0]*(N*N)                               # candidate bitmask of each open cell
+        count = [0]*(N*N)                              # ... and its size
+        places = [[0]*(N + 1) for _ in range(3*N)]     # places[u][v]: open cells of u that can take v
+        buckets = [set() for _ in range(N + 1)]        # open cells by candidate count
+        for c, v in enumerate(flat):
+            if v == 0:
+                r, col, bx = unit_of[c]
+                m = full_mask & ~(used[r] | used[col] | used[bx])
+                cand[c] = m
+                for val in symbols:
+                    if m >> (val - 1) & 1:
+                        count[c] += 1
+                        places[r][val] += 1
+                        places[col][val] += 1
+                        places[bx][val] += 1
+                buckets[count[c]].add(c)
+
+        # Placing val in c leaves some peer or unit with no option for it
+        def dead_end(c, val):
+            bit = 1 << (val - 1)
+            lost = {}
+            r, col, bx = unit_of[c]
+            # Every peer once: row and column, then the box cells outside both
+            peers = [p for p in units[r] + units[col] if p != c]
+            peers += [p for p in units[bx] if unit_of[p][0] != r and unit_of[p][1] != col]
+            for p in peers:
+                if cand[p] & bit:
+                    if cand[p] == bit:
+                        return True
+                    for u in unit_of[p]:
+                        lost[u] = lost.get(u, 0) + 1
+            return any(places[u][val] == k for u, k in lost.items())
+
+        left = sum(len(bk) for bk in buckets)
+        while left:
+            k = next(k for k in range(N + 1) if buckets[k])
+            c = next(iter(buckets[k]))
+            r, col, bx = unit_of[c]
+            # Least constraining first: fewest open cells sharing a unit that could also take val
+            options = sorted((places[r][val] + places[col][val] + places[bx][val], val)
+                             for val in symbols if cand[c] >> (val - 1) & 1)
+            val = next((val for _, val in options if not dead_end(c, val)), 0)
+            if val == 0:
+                for cell in range(N*N):
+                    g[cell // N][cell % N] = flat[cell]
+                if verbose:
+                    print(f"Lookahead greedy stuck at cell ({c // N},{c % N})")
+                return g, False
+            # Fill c and update its peers' candidates
+            flat[c] = val
+            bit = 1 << (val - 1)
+            buckets[k].discard(c)
+            left -= 1
+            for v in symbols:
+                if cand[c] >> (v - 1) & 1:
+                    places[r][v] -= 1
+                    places[col][v] -= 1
+                    places[bx][v] -= 1
+            cand[c] = 0
+            for p in units[r] + units[col] + units[bx]:
+                if cand[p] & bit:
+                    buckets[count[p]].discard(p)
+                    count[p] -= 1
+                    buckets[count[p]].add(p)
+                    cand[p] ^= bit
+                    for u in unit_of[p]:
+                        places[u][val] -= 1
+        for cell in range(N*N):
+            g[cell // N][cell % N] = flat[cell]
+        return g, True
+
     # Divide and Conquer using backtracking and recursion
     def dac(g):
         # Find empty cell
@@ -115,43 +320,350 @@ def BB_advancedsudoku4(S, N, C):
                 # Divide the original problem into a smaller subproblem where g[i][j] is assumed to be solved where the value = val
                 if dac(g):
                     return True
-                g[i][j] = '0'
+                g[i][j] = 0
         return False
 
+    # Same search as dac but reporting every step to trace; only picked when a trace is given,
+    # so the normal search carries no tracing checks at all
+    def traced_dac(g, depth=0):
+        loc = find_empty(g)
+        if not loc:
+            return True
+        i, j = loc
+        cell = i*N + j
+        trace.expand(cell, depth)
+        for val in symbols:
+            if is_valid(g, i, j, val):
+                g[i][j] = val
+                trace.assign(cell, val, depth)
+                if traced_dac(g, depth + 1):
+                    return True
+                g[i][j] = 0
+                trace.backtrack(cell, val, depth)
+        return False
+
+    # Same search as dac with a transposition table of dead ends
+    # What is left to solve below a node only depends on which values every row/column/box
+    # already holds, so nodes are keyed by a Zobrist hash of those contents, updated with three
+    # XORs (row, column, box) per fill. Different orders of earlier choices that leave the same contents share a key,
+    # so a subtree that failed once is never searched again. When the table is full the least
+    # recently hit dead end is evicted.
+    def tt_dac(g):
+        keys = get_zobrist(N)
+        dead = {}
+        probes = hits = evictions = 0
+
+        def visit(h):
+            nonlocal probes, hits, evictions
+            loc = find_empty(g)
+            if not loc:
+                return True
+            probes += 1
+            if h in dead:
+                hits += 1
+                dead[h] = dead.pop(h)
+                return False
+            i, j = loc
+            row, col, box = keys[i], keys[N + j], keys[2*N + box_id[i][j]]
+            for val in symbols:
+                if is_valid(g, i, j, val):
+                    g[i][j] = val
+                    if visit(h ^ row[val] ^ col[val] ^ box[val]):
+                        return True
+                    g[i][j] = 0
+            if len(dead) >= tt_size:
+                del dead[next(iter(dead))]
+                evictions += 1
+            dead[h] = True
+            return False
+
+        h = 0
+        for i in range(N):
+            for j in range(N):
+                v = g[i][j]
+                if v != 0:
+                    h ^= keys[i][v] ^ keys[N + j][v] ^ keys[2*N + box_id[i][j]][v]
+        solved = visit(h)
+        stats.update(tt_probes=probes, tt_hits=hits, tt_hit_rate=hits / probes if probes else 0.0,
+                     tt_entries=len(dead), tt_evictions=evictions)
+        return solved
+
+    # Divide and Conquer with conflict-directed backjumping
+    # Same cell order as dac, but every cell remembers which earlier choices ruled out its values
+    # (its conflict set). When a cell runs out of values the search jumps straight back to the
+    # latest of those choices instead of the previous cell, skipping subtrees that cannot help.
+    # Small conflict sets are also kept as nogoods so the same combination is never tried again.
+    def cbj(g):
+        empties = [(i, j) for i in range(N) for j in range(N) if g[i][j] == 0]
+        n = len(empties)
+        depth_of = {}                  # cell -> depth of its current assignment (clues have none)
+        conf = [set() for _ in range(n + 1)]
+        tried = [0]*(n + 1)            # next symbol to try at each depth
+        nogoods = {}                   # (cell, val) -> nogoods (sets of (cell, val)) containing it
+        nodes = backjumps = recorded = pruned = 0
+
+        # Depth of the earliest assignment clashing with val at (i,j); -1 if a clue clashes
+        def culprit(i, j, val):
+            hit = None
+            for x in range(N):
+                for cell in ((i, x), (x, j)):
+                    if g[cell[0]][cell[1]] == val:
+                        k = depth_of.get(cell, -1)
+                        if k < 0:
+                            return -1
+                        if hit is None or k < hit:
+                            hit = k
+            for cell in box_cells[box_id[i][j]]:
+                if g[cell[0]][cell[1]] == val:
+                    k = depth_of.get(cell, -1)
+                    if k < 0:
+                        return -1
+                    if hit is None or k < hit:
+                        hit = k
+            return hit
+
+        d = 0
+        while d < n:
+            i, j = empties[d]
+            placed = False
+            while tried[d] < N:
+                val = symbols[tried[d]]
+                tried[d] += 1
+                k = culprit(i, j, val)
+                if k is not None:
+                    if k >= 0:
+                        conf[d].add(k)
+                    continue
+                # Skip values that would complete a recorded nogood
+                blocked = None
+                for ng in nogoods.get(((i, j), val), ()):
+                    if all(c == (i, j) or (c in depth_of and g[c[0]][c[1]] == v) for c, v in ng):
+                        blocked = ng
+                        break
+                if blocked is not None:
+                    pruned += 1
+                    conf[d].update(depth_of[c] for c, v in blocked if c != (i, j))
+                    continue
+                g[i][j] = val
+                depth_of[(i, j)] = d
+                nodes += 1
+                placed = True
+                break
+            if placed:
+                d += 1
+                tried[d] = 0
+                conf[d] = set()
+                continue
+            # Dead end: every value here is ruled out by the choices in conf[d]
+            if not conf[d]:
+                break
+            h = max(conf[d])
+            if len(conf[d]) <= nogood_size:
+                ng = frozenset((empties[k], g[empties[k][0]][empties[k][1]]) for k in conf[d])
+                for lit in ng:
+                    nogoods.setdefault(lit, []).append(ng)
+                recorded += 1
+            conf[h] |= conf[d] - {h}
+            if h < d - 1:
+                backjumps += 1
+            # Undo everything from the culprit down; the culprit moves on to its next value
+            for k in range(d - 1, h - 1, -1):
+                ci, cj = empties[k]
+                g[ci][cj] = 0
+                del depth_of[(ci, cj)]
+            d = h
+        if d < n:
+            # Unsolvable: leave the grid as it came in, like dac
+            for k in range(d):
+                ci, cj = empties[k]
+                g[ci][cj] = 0
+        stats.update(nodes=nodes, backjumps=backjumps, nogoods=recorded, nogood_prunes=pruned)
+        return d == n
+
     # Dynamic Programming domain constraint tabulation
     def dp(g):
-        # Map all possible values for each 0 value
-        dom = {(i,j): set(symbols) if g[i][j]=='0' else {g[i][j]} 
-               for i in range(N) for j in range(N)}
-        # Eliminate overlapping domain constraints
-        changed = True
-        while changed:
-            changed = False
-            for (i,j),dset in dom.items():
-                if len(dset) == 1:
-                    val = next(iter(dset))
-                    # eliminate this from peers
-                    for k in range(N):
-                        if (i,k)!= (i,j) and val in dom[(i,k)]:
-                            dom[(i,k)].discard(val); changed=True
-                        if (k,j)!= (i,j) and val in dom[(k,j)]:
-                            dom[(k,j)].discard(val); changed=True
-                    br, bc = (i//b)*b, (j//b)*b
-                    for ii in range(br, br+b):
-                        for jj in range(bc, bc+b):
-                            if (ii,jj)!=(i,j) and val in dom[(ii,jj)]:
-                                dom[(ii,jj)].discard(val); changed=True
+        units, unit_of = get_units(N)
+        # Domain of every cell (i*N + j) as a bitmask, bit v-1 set while symbol v is possible,
+        # with the domain sizes alongside. Up to 64 symbols a domain is one machine word.
+        # (a uint64 view of a bytearray rather than array('Q'): importing array pulls in collections)
+        dom = memoryview(bytearray(8*N*N)).cast('Q') if N <= 64 else [0] * (N*N)
+        size = bytearray([N]) * (N*N) if N <= 255 else [N] * (N*N)
+        for i in range(N):
+            for j in range(N):
+                if g[i][j] != 0:
+                    dom[i*N + j] = 1 << (g[i][j] - 1)
+                    size[i*N + j] = 1
+                else:
+                    dom[i*N + j] = full_mask
+        # Eliminate overlapping domain constraints: remove every fixed value from its peers,
+        # and queue up peers that get fixed by that in turn
+        queue = [c for c in range(N*N) if size[c] == 1]
+        while queue:
+            c = queue.pop()
+            bit = dom[c]
+            for u in unit_of[c]:
+                for p in units[u]:
+                    if p != c and dom[p] & bit:
+                        dom[p] ^= bit
+                        size[p] -= 1
+                        if size[p] == 1:
+                            queue.append(p)
+                        elif size[p] == 0:
+                            return False
         # build back to grid
-        for (i,j),dset in dom.items():
-            if not dset:
-                return False
-            if len(dset)==1:
-                g[i][j] = next(iter(dset))
+        for c in range(N*N):
+            if size[c] == 1:
+                i, j = divmod(c, N)
+                if g[i][j] == 0:
+                    val = dom[c].bit_length()
+                    if trace is not None:
+                        trace.propagate(c, val)
+                    g[i][j] = val
         # if solved end
-        if all(g[i][j] != '0' for i in range(N) for j in range(N)):
+        if all(g[i][j] != 0 for i in range(N) for j in range(N)):
             return True
         # Use divide and conquer for remaining cells if domain constraints cant reduce
-        return dac(g)
+        return search(g)
+
+    # Min-conflicts local search for very large grids (no systematic search)
+    # Start from a random fill where every box holds each symbol once, then repeatedly
+    # swap two free cells inside a box to reduce row/column conflicts
+    def mc(g):
+        import random
+        fixed = [[g[i][j] != 0 for j in range(N)] for i in range(N)]
+        # Free cells of every box, and the symbols each box is missing
+        boxes, missing = [], []
+        for box in box_cells:
+            cells = [(i, j) for i, j in box if not fixed[i][j]]
+            have = {g[i][j] - 1 for i, j in box if fixed[i][j]}
+            need = [k for k in range(N) if k not in have]
+            # Clues repeat inside a box -> no box-consistent fill exists
+            if len(need) != len(cells):
+                stats.update(converged=False, iterations=0, restarts=0, conflicts=None)
+                return False
+            if len(cells) > 1:
+                boxes.append(cells)
+            missing.append((cells, need))
+        box_of = {cell: cells for cells in boxes for cell in cells}
+        val = [[g[i][j] - 1 if fixed[i][j] else -1 for j in range(N)] for i in range(N)]
+
+        # Count how many times each symbol appears in every row/col
+        def restart():
+            for cells, need in missing:
+                need = need[:]
+                random.shuffle(need)
+                for (i, j), k in zip(cells, need):
+                    val[i][j] = k
+            rows = [[0]*N for _ in range(N)]
+            cols = [[0]*N for _ in range(N)]
+            for i in range(N):
+                for j in range(N):
+                    rows[i][val[i][j]] += 1
+                    cols[j][val[i][j]] += 1
+            cost = sum(c - 1 for line in rows + cols for c in line if c > 1)
+            return rows, cols, cost
+
+        def conflicted(i, j):
+            k = val[i][j]
+            return rows[i][k] > 1 or cols[j][k] > 1
+
+        # Change in conflicts for one line when symbol out_k leaves and in_k enters
+        def line_delta(cnt, out_k, in_k):
+            return (-1 if cnt[out_k] > 1 else 0) + (1 if cnt[in_k] > 0 else 0)
+
+        def swap_delta(i1, j1, i2, j2):
+            k1, k2 = val[i1][j1], val[i2][j2]
+            d = 0
+            if i1 != i2:
+                d += line_delta(rows[i1], k1, k2) + line_delta(rows[i2], k2, k1)
+            if j1 != j2:
+                d += line_delta(cols[j1], k1, k2) + line_delta(cols[j2], k2, k1)
+            return d
+
+        def do_swap(i1, j1, i2, j2):
+            k1, k2 = val[i1][j1], val[i2][j2]
+            rows[i1][k1] -= 1; rows[i1][k2] += 1
+            rows[i2][k2] -= 1; rows[i2][k1] += 1
+            cols[j1][k1] -= 1; cols[j1][k2] += 1
+            cols[j2][k2] -= 1; cols[j2][k1] += 1
+            val[i1][j1], val[i2][j2] = k2, k1
+            # Only cells in the touched lines holding k1/k2 can change conflict status
+            for i, j in ((i1, j1), (i2, j2)):
+                for x in range(N):
+                    for cell in ((i, x), (x, j)):
+                        if cell in box_of and val[cell[0]][cell[1]] in (k1, k2):
+                            if conflicted(*cell):
+                                bad.add(cell)
+                            else:
+                                bad.discard(cell)
+
+        deadline = time.perf_counter() + time_limit
+        free = len(box_of)
+        tenure = max(2, min(10, free // 10))
+        stall_limit = max(200, 20 * free)
+        rows, cols, cost = restart()
+        bad = {cell for cell in box_of if conflicted(*cell)}
+        best_cost, best_val = cost, [row[:] for row in val]
+        tabu = {}
+        it = restarts = stall = 0
+        while cost > 0:
+            it += 1
+            if it % 256 == 0 and time.perf_counter() > deadline:
+                break
+            if stall > stall_limit:
+                # Stuck in a plateau/local minimum -> start over from a new random fill
+                rows, cols, cost = restart()
+                bad = {cell for cell in box_of if conflicted(*cell)}
+                tabu.clear()
+                restarts += 1
+                stall = 0
+            # Remaining conflicts are all between cells that cannot move
+            if not bad:
+                break
+            i1, j1 = random.choice(tuple(bad))
+            # Best non-tabu swap partner in the same box (tabu is ignored if it beats the best so far)
+            move, move_d = None, None
+            for i2, j2 in box_of[(i1, j1)]:
+                if (i2, j2) == (i1, j1):
+                    continue
+                d = swap_delta(i1, j1, i2, j2)
+                if tabu.get((i2, j2), 0) > it and cost + d >= best_cost:
+                    continue
+                if move is None or d < move_d or (d == move_d and random.random() < 0.5):
+                    move, move_d = (i2, j2), d
+            if move is None:
+                stall += 1
+                continue
+            do_swap(i1, j1, *move)
+            cost += move_d
+            tabu[(i1, j1)] = tabu[move] = it + tenure
+            if cost < best_cost:
+                best_cost, best_val = cost, [row[:] for row in val]
+                stall = 0
+            else:
+                stall += 1
+
+        converged = cost == 0
+        if not converged:
+            val[:] = best_val
+            rows = [[0]*N for _ in range(N)]
+            cols = [[0]*N for _ in range(N)]
+            for i in range(N):
+                for j in range(N):
+                    rows[i][val[i][j]] += 1
+                    cols[j][val[i][j]] += 1
+        # Write back; cells still in conflict stay blank so the result is a valid partial grid
+        for i, j in box_of:
+            if converged or not conflicted(i, j):
+                g[i][j] = val[i][j] + 1
+        for cells, need in missing:
+            if len(cells) == 1:
+                i, j = cells[0]
+                if converged or not conflicted(i, j):
+                    g[i][j] = val[i][j] + 1
+        stats.update(converged=converged, iterations=it, restarts=restarts,
+                     conflicts=cost if converged else best_cost)
+        return converged
 
     # Check if a cell value is valid given its surrounding matrix
     def is_valid(g, r, c, v):
@@ -160,25 +672,54 @@ def BB_advancedsudoku4(S, N, C):
             if g[r][x] == v or g[x][c] == v:
                 return False
         # box check
-        br, bc = (r//b)*b, (c//b)*b
-        for ii in range(br, br+b):
-            for jj in range(bc, bc+b):
-                if g[ii][jj] == v:
-                    return False
+        for ii, jj in box_cells[box_id[r][c]]:
+            if g[ii][jj] == v:
+                return False
         return True
 
+    if trace is not None:
+        search = traced_dac
+    elif tt_size > 0:
+        search = tt_dac
+    else:
+        search = dac
+
     # Call correct function based on C value in BB_advancedsudoku4 function call
     if C == 'greedy':
         sol, ok = greedy(grid)
-        return sol
+    elif C == 'lookahead':
+        sol, ok = lookahead(grid)
     elif C == 'dac':
-        dac(grid)
-        return grid
+        search(grid)
+        sol = grid
     elif C == 'dp':
         dp(grid)
-        return grid
+        sol = grid
+    elif C == 'cbj':
+        cbj(grid)
+        sol = grid
+    elif C == 'mc':
+        mc(grid)
+        sol = grid
+    elif C == 'sat':
+        # The CDCL SAT backend lives in its own module and is only imported when asked for
+        from sudoku_sat import solve_sat
+        solve_sat(grid, N, time_limit=time_limit, stats=stats)
+        sol = grid
     else:
         raise ValueError(f"'{C}' is not a valid strategy")
+    return codec.decode(sol)
+
+
+# Optional features that need third-party packages, imported on first attribute access
+# ex. BB_advancedsudoku4.generate_puzzles loads sudoku_bulk (and numpy) only when used
+_LAZY = {'generate_puzzles': 'sudoku_bulk'}
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Print matrix R (sudoku result)
@@ -186,7 +727,7 @@ def print_sudoku(R, size):
     div = math.sqrt(size)
     print("My awesome program solved your sudoku puzzle! Here is the answer:\n")
     for i,row in enumerate(R):
-            line = ' '.join(row)
+            line = ' '.join(str(x) for x in row)
             if i % div == 0 and i > 1:
                 print('-----+------+-----')
                 #print('---+---')
@@ -195,7 +736,7 @@ def print_sudoku(R, size):
 # Run functions
 def main():
     size = 4 # Size of the sudoku matrix
-    approach = 'dp' # ‘greedy’ is for greedy approach, ‘dac’ is for divide and conquer approach, and ‘dp’ is for dynamic programming
+    approach = 'dp' # ‘greedy’ is for greedy approach, ‘lookahead’ is for greedy with lookahead (still no backtracking), ‘dac’ is for divide and conquer approach, ‘cbj’ is for divide and conquer with backjumping, ‘dp’ is for dynamic programming, ‘mc’ is for min-conflicts local search, and ‘sat’ is for the CDCL SAT backend
 
     # Generate a sudoku puzzle
     S = generate_puzzle(size, difficulty=2)
@@ -0,0 +1,67 @@
+# bench_memory.py
+# --------------------------------------
+# Guards the memory of the 'dp' strategy for each puzzle size, in two parts:
+#   1. Tables: what building the size's cached codec and lookup tables costs, once per process.
+#   2. Solve: the largest peak over a fixed set of easy puzzles (seeded, so every run sees the
+#      same ones), each solved with 'dp' under tracemalloc once the tables exist.
+#   3. Exit with status 1 if either part of any size is over its budget.
+#
+# Usage:
+#   python bench_memory.py [runs]
+
+import random
+import sys
+import tracemalloc
+
+from BB_advancedsudoku4 import BB_advancedsudoku4, generate_puzzle, get_codec, get_tables, get_units
+
+# size -> (tables KiB, solve peak KiB) allowed. At least 1.5x measured, and 2x for the small
+# sizes, where a few KiB from an allocator or Python change is a large share
+BUDGET_KIB = {4: (12, 8), 9: (36, 12), 16: (96, 24), 25: (192, 48), 36: (400, 96),
+              49: (750, 180), 64: (1300, 300)}
+RUNS = 3
+SEED = 0
+
+def tables_kib(N):
+    """
+    Memory (KiB) the cached codec and lookup tables for size N hold once built.
+    """
+    tracemalloc.start()
+    get_codec(N)
+    get_tables(N)
+    get_units(N)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def peak_kib(puzzle, N):
+    """
+    Peak memory (KiB) traced while solving puzzle with 'dp'.
+    """
+    tracemalloc.start()
+    R = BB_advancedsudoku4(puzzle, N, 'dp', verbose=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert all('0' not in row for row in R), f"dp did not solve a {N}x{N} puzzle"
+    return peak / 1024
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    failed = []
+    print("size  tables KiB  budget  solve KiB  budget")
+    for N, (table_budget, solve_budget) in BUDGET_KIB.items():
+        # Tables first, before generate_puzzle or a solve has built any of them
+        tables = tables_kib(N)
+        random.seed(SEED + N)
+        peak = max(peak_kib(generate_puzzle(N, 0), N) for _ in range(runs))
+        over = tables > table_budget or peak > solve_budget
+        print(f"{N:4d}  {tables:10.1f}  {table_budget:6d}  {peak:9.1f}  {solve_budget:6d}"
+              f"{'  FAIL' if over else ''}")
+        if over:
+            failed.append(N)
+    if failed:
+        print(f"FAIL: over budget for N = {', '.join(map(str, failed))}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_startup.py
+# --------------------------------------
+# Guards the cold-start latency of "import the solver and solve one puzzle":
+#   1. Start a fresh interpreter for every run so nothing is cached between runs.
+#   2. Time `import BB_advancedsudoku4` + one 9×9 'dp' solve inside that interpreter.
+#   3. Check that no heavy optional dependency (numpy/pandas/matplotlib) got imported.
+#   4. Exit with status 1 if the median run is over the budget.
+#
+# Usage:
+#   python bench_startup.py [budget_ms] [runs]
+
+import os
+import subprocess
+import sys
+
+BUDGET_MS = 10.0
+RUNS = 15
+HEAVY = ('numpy', 'pandas', 'matplotlib')
+
+# Fixed medium 9×9 puzzle so every run does the same work
+PUZZLE = [
+    "530070000",
+    "600195000",
+    "098000060",
+    "800060003",
+    "400803001",
+    "700020006",
+    "060000280",
+    "000419005",
+    "000080079",
+]
+
+CHILD = f"""
+import sys, time
+t0 = time.perf_counter()
+import BB_advancedsudoku4
+t1 = time.perf_counter()
+S = [list(row) for row in {PUZZLE!r}]
+R = BB_advancedsudoku4.BB_advancedsudoku4(S, 9, 'dp')
+t2 = time.perf_counter()
+assert all('0' not in row for row in R)
+heavy = [m for m in {HEAVY!r} if m in sys.modules]
+print((t1 - t0) * 1000, (t2 - t1) * 1000, ','.join(heavy))
+"""
+
+def cold_start_ms():
+    """
+    Run CHILD in a fresh interpreter.
+    Returns (import ms, solve ms, heavy modules imported).
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, '-c', CHILD], cwd=here, check=True,
+                         capture_output=True, text=True).stdout.split()
+    return float(out[0]), float(out[1]), out[2].split(',') if len(out) > 2 else []
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else RUNS
+    samples = []
+    for _ in range(runs):
+        import_ms, solve_ms, heavy = cold_start_ms()
+        if heavy:
+            print(f"FAIL: solving one puzzle imported {', '.join(heavy)}")
+            sys.exit(1)
+        samples.append((import_ms + solve_ms, import_ms, solve_ms))
+    samples.sort()
+    median, import_ms, solve_ms = samples[len(samples)//2]
+    print(f"cold import + solve: median {median:.2f} ms (import {import_ms:.2f} ms, "
+          f"solve {solve_ms:.2f} ms), min {samples[0][0]:.2f} ms, max {samples[-1][0]:.2f} ms "
+          f"over {runs} runs (budget {budget:.1f} ms)")
+    if median > budget:
+        print("FAIL: over budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,178 +1,39 @@
-# sudoku_experiments.py
+# experiment.py
 # --------------------------------------
-# Self-contained script to:
+# Script to:
 #   1. Generate Sudoku puzzles (4×4, 9×9, 16×16) at easy/med/hard.
-#   2. Solve them with three strategies: greedy, dac, dp.
+#   2. Solve them with four strategies (greedy, lookahead, dac, dp) from BB_advancedsudoku4.
 #   3. Measure solve time and peak memory usage via tracemalloc.
 #   4. Run a 4×4 greedy‐success experiment (1000 runs).
 #   5. Measure success percentage vs puzzle size (4,9,16).
 #   6. Save timing/memory/success results to CSV, print markdown tables, and plot graphs.
 #
+# Every single run is an independent task. Tasks run across a process pool and each
+# result is appended to a checkpoint file as soon as it finishes, so an interrupted
+# run picks up where it stopped. Plotting is a separate step that reads the CSVs.
+#
 # Usage:
 #   pip install pandas matplotlib
-#   python sudoku_experiments.py
+#   python experiment.py run [--workers 8] [--checkpoint experiment_results.jsonl]
+#   python experiment.py plot
 
-import time
+import argparse
+import json
+import os
 import random
-import copy
+import time
 import tracemalloc
-import pandas as pd
-import matplotlib.pyplot as plt
+import zlib
+from multiprocessing import Pool
 
-# --- Helper: symbol domain ---
-
-def get_symbols(N):
-    """
-    Return valid symbols for an N×N Sudoku:
-      - '1'..'9' for N ≤ 9
-      - then 'A','B',… for N > 9
-    """
-    digits = [str(i) for i in range(1, min(N, 9) + 1)]
-    if N > 9:
-        letters = [chr(ord('A') + i) for i in range(N - 9)]
-        return digits + letters
-    return digits
+# The solver lives in BB_advancedsudoku4 (no third-party dependencies);
+# pandas/matplotlib are only imported once results need tabulating or plotting
+from BB_advancedsudoku4 import generate_puzzle, BB_advancedsudoku4, get_codec, get_tables, get_units
 
-# --- Puzzle generator (pattern-based) ---
-
-def generate_puzzle(N, difficulty):
-    """
-    Generate an N×N Sudoku puzzle without backtracking:
-      1. Fill with a math pattern.
-      2. Shuffle rows/cols and symbols.
-      3. Remove blanks based on difficulty (0:25%, 1:33%, 2:50%).
-    """
-    b = int(N**0.5)
-    symbols = get_symbols(N)
-
-    # 1) base pattern
-    base = [[(b*(r % b) + r//b + c) % N for c in range(N)] for r in range(N)]
-
-    # 2) shuffle rows/cols in bands
-    def shuffle_band(lines):
-        bands = [lines[i:i+b] for i in range(0, N, b)]
-        for band in bands:
-            random.shuffle(band)
-        random.shuffle(bands)
-        return [x for band in bands for x in band]
-
-    rows = shuffle_band(list(range(N)))
-    cols = shuffle_band(list(range(N)))
-    perm = symbols[:]
-    random.shuffle(perm)
-
-    full = [[perm[base[rows[r]][cols[c]]] for c in range(N)] for r in range(N)]
-
-    # 3) blank out
-    total = N*N
-    blanks = {0: total//4, 1: total//3, 2: total//2}[difficulty]
-    positions = list(range(total))
-    random.shuffle(positions)
-    puzzle = copy.deepcopy(full)
-    for pos in positions[:blanks]:
-        puzzle[pos//N][pos%N] = '0'
-    return puzzle
-
-# --- Solver: your exact implementations ---
-
-def BB_advancedsudoku4(S, N, C):
-    """
-    Solve N×N Sudoku S with strategy C ('greedy','dac','dp').
-    Returns the solved grid.
-    """
-    symbols = get_symbols(N)
-    grid = copy.deepcopy(S)
-    b = int(N**0.5)
-
-    full_mask = (1 << N) - 1
-    sym2bit = {sym: 1 << idx for idx, sym in enumerate(symbols)}
-    bit2sym = {1 << idx: sym for idx, sym in enumerate(symbols)}
-
-    def find_empty(g):
-        for i in range(N):
-            for j in range(N):
-                if g[i][j] == '0':
-                    return i, j
-        return None
-
-    def greedy(g):
-        for i in range(N):
-            for j in range(N):
-                if g[i][j] == '0':
-                    for val in symbols:
-                        if is_valid(g, i, j, val):
-                            g[i][j] = val
-                            break
-                    if g[i][j] == '0':
-                        # stuck
-                        return g, False
-        return g, True
-
-    def dac(g):
-        loc = find_empty(g)
-        if not loc:
-            return True
-        i, j = loc
-        for val in symbols:
-            if is_valid(g, i, j, val):
-                g[i][j] = val
-                if dac(g):
-                    return True
-                g[i][j] = '0'
-        return False
-
-    def dp(g):
-        dom = {
-            (i,j): set(symbols) if g[i][j]=='0' else {g[i][j]}
-            for i in range(N) for j in range(N)
-        }
-        changed = True
-        while changed:
-            changed = False
-            for (i,j), dset in dom.items():
-                if len(dset) == 1:
-                    v = next(iter(dset))
-                    for k in range(N):
-                        if (i,k)!=(i,j) and v in dom[(i,k)]:
-                            dom[(i,k)].discard(v); changed=True
-                        if (k,j)!=(i,j) and v in dom[(k,j)]:
-                            dom[(k,j)].discard(v); changed=True
-                    br, bc = (i//b)*b, (j//b)*b
-                    for ii in range(br, br+b):
-                        for jj in range(bc, bc+b):
-                            if (ii,jj)!=(i,j) and v in dom[(ii,jj)]:
-                                dom[(ii,jj)].discard(v); changed=True
-        for (i,j), dset in dom.items():
-            if not dset:
-                return False
-            if len(dset)==1 and grid[i][j]=='0':
-                g[i][j] = next(iter(dset))
-        if all(g[i][j] != '0' for i in range(N) for j in range(N)):
-            return True
-        return dac(g)
-
-    def is_valid(g, r, c, v):
-        for x in range(N):
-            if g[r][x]==v or g[x][c]==v:
-                return False
-        br, bc = (r//b)*b, (c//b)*b
-        for ii in range(br, br+b):
-            for jj in range(bc, bc+b):
-                if g[ii][jj]==v:
-                    return False
-        return True
-
-    if C == 'greedy':
-        sol, _ = greedy(grid)
-    elif C == 'dac':
-        dac(grid)
-        sol = grid
-    elif C == 'dp':
-        dp(grid)
-        sol = grid
-    else:
-        raise ValueError(f"'{C}' is not valid")
-    return sol
+CHECKPOINT = 'experiment_results.jsonl'
+DIFF_CSV = '9x9_diff_all_strategies.csv'
+SIZE_CSV = 'size_easy_all_strategies.csv'
+SUCC_CSV = 'success_pct_by_size.csv'
 
 # --- Measurement wrapper ---
 
@@ -182,90 +43,199 @@ def measure(puzzle, N, strat):
     """
     tracemalloc.start()
     t0 = time.perf_counter()
-    _ = BB_advancedsudoku4(puzzle, N, strat)
+    _ = BB_advancedsudoku4(puzzle, N, strat, verbose=False)
     t1 = time.perf_counter()
     _, peak = tracemalloc.get_traced_memory()
     tracemalloc.stop()
     return t1 - t0, peak
 
-# --- Main experiments ---
+def warm_tables(sizes):
+    """
+    Pool initializer: build the per-size codecs and lookup tables the solver caches per process,
+    so no measured solve pays for them (which task would is up to the scheduler).
+    """
+    for N in sizes:
+        get_codec(N)
+        get_tables(N)
+        get_units(N)
 
-def run_experiments():
-    repeats = 5
-    strategies = ['greedy','dac','dp']
+# --- Sweep grid ---
 
+def expand_tasks(strategies=('greedy','lookahead','dac','dp'), repeats=5, greedy_runs=1000, succ_runs=500,
+                 sizes=(4,9,16)):
+    """
+    Expand the whole experiment into independent tasks (one solve each).
+    Every task has a stable 'task_id'; runs that share a puzzle key get the same
+    puzzle for every strategy.
+    """
+    tasks = []
+    def add(section, N, difficulty, strat, run):
+        puzzle_key = f"{section}/N{N}/d{difficulty}/r{run}"
+        tasks.append({
+            'task_id': f"{puzzle_key}/{strat}",
+            'section': section,
+            'size': N,
+            'difficulty': difficulty,
+            'strategy': strat,
+            'run': run,
+            'seed': zlib.crc32(puzzle_key.encode()),
+        })
     # 1) 9×9 by difficulty
-    rows_diff = []
     for diff in [0,1,2]:
         for strat in strategies:
-            times, mems = [], []
-            for _ in range(repeats):
-                p = generate_puzzle(9, diff)
-                t, m = measure(p, 9, strat)
-                times.append(t); mems.append(m)
-            rows_diff.append({
-                'difficulty': diff,
-                'strategy': strat,
-                'avg_time_s': sum(times)/repeats,
-                'avg_peak_mem_KiB': sum(mems)/repeats/1024
-            })
-    df_diff = pd.DataFrame(rows_diff)
-    df_diff.to_csv('9x9_diff_all_strategies.csv', index=False)
-    print("\n### 9×9 Difficulty Results ###\n")
-    print(df_diff.to_markdown(index=False))
-
-    # 2) Easy puzzles for sizes 4,9,16
-    rows_size = []
-    for N in [4,9,16]:
+            for r in range(repeats):
+                add('difficulty', 9, diff, strat, r)
+    # 2) Easy puzzles for each size
+    for N in sizes:
         for strat in strategies:
-            times, mems = [], []
-            for _ in range(repeats):
-                p = generate_puzzle(N, 0)
-                t, m = measure(p, N, strat)
-                times.append(t); mems.append(m)
-            rows_size.append({
-                'size': N,
-                'strategy': strat,
-                'avg_time_s': sum(times)/repeats,
-                'avg_peak_mem_KiB': sum(mems)/repeats/1024
-            })
-    df_size = pd.DataFrame(rows_size)
-    df_size.to_csv('size_easy_all_strategies.csv', index=False)
-    print("\n### Puzzle Size Results (Easy) ###\n")
-    print(df_size.to_markdown(index=False))
-
-    # 3) 4×4 Greedy success rate (1000 runs)
-    runs = 1000
-    success_4 = 0
-    for _ in range(runs):
-        p = generate_puzzle(4, 0)
-        sol = BB_advancedsudoku4(p, 4, 'greedy')
-        if all(sol[i][j] != '0' for i in range(4) for j in range(4)):
-            success_4 += 1
-    print(f"\nGreedy success on 4×4 (easy) over {runs} runs: {success_4}/{runs} = {success_4/runs*100:.1f}%\n")
-
-    # 4) Success percentage vs puzzle size (4,9,16)
-    rows_succ = []
-    runs_succ = 500
-    for N in [4,9,16]:
+            for r in range(repeats):
+                add('size', N, 0, strat, r)
+    # 3) 4×4 Greedy success rate
+    for r in range(greedy_runs):
+        add('greedy4', 4, 0, 'greedy', r)
+    # 4) Success percentage vs puzzle size
+    for N in sizes:
         for strat in strategies:
-            succ = 0
-            for _ in range(runs_succ):
-                p = generate_puzzle(N, 0)
-                sol = BB_advancedsudoku4(p, N, strat)
-                if all(sol[i][j] != '0' for i in range(N) for j in range(N)):
-                    succ += 1
-            rows_succ.append({
-                'size': N,
-                'strategy': strat,
-                'success_pct': succ / runs_succ * 100
-            })
-    df_succ = pd.DataFrame(rows_succ)
-    df_succ.to_csv('success_pct_by_size.csv', index=False)
-    print("\n### Success % by Puzzle Size ###\n")
-    print(df_succ.to_markdown(index=False))
-
-    # --- Plots ---
+            for r in range(succ_runs):
+                add('success', N, 0, strat, r)
+    return tasks
+
+def run_task(task):
+    """
+    Worker: generate the task's puzzle from its seed and solve it once.
+    Timing sections record time/peak memory, success sections record whether it was solved.
+    """
+    random.seed(task['seed'])
+    N = task['size']
+    p = generate_puzzle(N, task['difficulty'])
+    result = dict(task)
+    if task['section'] in ('difficulty', 'size'):
+        t, m = measure(p, N, task['strategy'])
+        result.update(time_s=t, peak_mem_bytes=m)
+    else:
+        sol = BB_advancedsudoku4(p, N, task['strategy'], verbose=False)
+        result['solved'] = all(sol[i][j] != '0' for i in range(N) for j in range(N))
+    return result
+
+# --- Checkpoint file (one JSON result per line) ---
+
+def load_results(checkpoint=CHECKPOINT):
+    """
+    Read every completed result from the checkpoint. A line cut off by a crash is ignored.
+    """
+    results = {}
+    if not os.path.exists(checkpoint):
+        return results
+    with open(checkpoint) as f:
+        for line in f:
+            try:
+                res = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            results[res['task_id']] = res
+    return results
+
+def drop_partial_line(checkpoint=CHECKPOINT):
+    """
+    Cut off a last line left half-written by a crash so new results start on a fresh line.
+    """
+    if not os.path.exists(checkpoint):
+        return
+    with open(checkpoint, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+# --- Main experiments ---
+
+def run_experiments(workers=None, checkpoint=CHECKPOINT, tasks=None):
+    """
+    Run every task not already in the checkpoint, appending results as they finish,
+    then write the CSVs / tables from everything in the checkpoint.
+    """
+    if tasks is None:
+        tasks = expand_tasks()
+    done = load_results(checkpoint)
+    todo = [t for t in tasks if t['task_id'] not in done]
+    print(f"{len(tasks)} tasks, {len(tasks) - len(todo)} already done, {len(todo)} to run")
+
+    if todo:
+        # Shuffle so slow tasks (large N, dac) are spread across workers instead of bunched at the end
+        random.Random(0).shuffle(todo)
+        drop_partial_line(checkpoint)
+        chunk = max(1, len(todo) // ((workers or os.cpu_count() or 1) * 16))
+        sizes = sorted({t['size'] for t in todo})
+        with open(checkpoint, 'a') as out, \
+                Pool(workers, initializer=warm_tables, initargs=(sizes,)) as pool:
+            for i, res in enumerate(pool.imap_unordered(run_task, todo, chunksize=chunk), 1):
+                out.write(json.dumps(res) + '\n')
+                out.flush()
+                if i % 500 == 0 or i == len(todo):
+                    print(f"  {i}/{len(todo)} tasks done")
+
+    results = load_results(checkpoint)
+    summarize([results[t['task_id']] for t in tasks if t['task_id'] in results])
+
+def summarize(results):
+    """
+    Aggregate task results into the three CSVs and print them as markdown tables.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(results)
+
+    timing = df[df['section'] == 'difficulty']
+    if len(timing):
+        df_diff = (timing.groupby(['difficulty', 'strategy'], sort=False)
+                   .agg(avg_time_s=('time_s', 'mean'), avg_peak_mem_KiB=('peak_mem_bytes', 'mean'))
+                   .reset_index())
+        df_diff['avg_peak_mem_KiB'] /= 1024
+        df_diff.to_csv(DIFF_CSV, index=False)
+        print("\n### 9×9 Difficulty Results ###\n")
+        print(df_diff.to_markdown(index=False))
+
+    timing = df[df['section'] == 'size']
+    if len(timing):
+        df_size = (timing.groupby(['size', 'strategy'], sort=False)
+                   .agg(avg_time_s=('time_s', 'mean'), avg_peak_mem_KiB=('peak_mem_bytes', 'mean'))
+                   .reset_index())
+        df_size['avg_peak_mem_KiB'] /= 1024
+        df_size.to_csv(SIZE_CSV, index=False)
+        print("\n### Puzzle Size Results (Easy) ###\n")
+        print(df_size.to_markdown(index=False))
+
+    greedy4 = df[df['section'] == 'greedy4']
+    if len(greedy4):
+        runs, success_4 = len(greedy4), int(greedy4['solved'].sum())
+        print(f"\nGreedy success on 4×4 (easy) over {runs} runs: {success_4}/{runs} = {success_4/runs*100:.1f}%\n")
+
+    succ = df[df['section'] == 'success']
+    if len(succ):
+        df_succ = (succ.astype({'solved': bool}).groupby(['size', 'strategy'], sort=False)['solved']
+                   .mean().mul(100).rename('success_pct').reset_index())
+        df_succ.to_csv(SUCC_CSV, index=False)
+        print("\n### Success % by Puzzle Size ###\n")
+        print(df_succ.to_markdown(index=False))
+
+    print("\nCSV files generated:\n"
+          f"{DIFF_CSV}\n"
+          f"{SIZE_CSV}\n"
+          f"{SUCC_CSV}\n")
+
+# --- Plots ---
+
+def plot_results():
+    """
+    Plot the stored CSV results; does not run any experiments.
+    """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    df_diff = pd.read_csv(DIFF_CSV)
+    df_size = pd.read_csv(SIZE_CSV)
+    df_succ = pd.read_csv(SUCC_CSV)
+    strategies = list(dict.fromkeys(df_diff['strategy']))
+
     # 9×9 time & memory
     plt.figure()
     for strat in strategies:
@@ -305,10 +275,20 @@ def run_experiments():
     plt.title('Solver Success Rate vs Puzzle Size')
     plt.ylim(0, 105); plt.legend(); plt.grid(); plt.show()
 
-    print("\nCSV files generated:\n"
-          "9x9_diff_all_strategies.csv\n"
-          "size_easy_all_strategies.csv\n"
-          "success_pct_by_size.csv\n")
+def main():
+    parser = argparse.ArgumentParser(description="Sudoku strategy experiments")
+    sub = parser.add_subparsers(dest='command')
+    run = sub.add_parser('run', help="run (or resume) the experiments and write the CSVs")
+    run.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    run.add_argument('--checkpoint', default=CHECKPOINT, help="results file used to resume")
+    sub.add_parser('plot', help="plot the CSVs written by 'run'")
+    args = parser.parse_args()
+
+    if args.command == 'plot':
+        plot_results()
+    else:
+        run_experiments(workers=getattr(args, 'workers', None),
+                        checkpoint=getattr(args, 'checkpoint', CHECKPOINT))
 
 if __name__ == "__main__":
-    run_experiments()
+    main()
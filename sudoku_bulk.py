@@ -0,0 +1,210 @@
+# sudoku_bulk.py
+# --------------------------------------
+# Vectorized bulk puzzle generator for benchmark corpora and load tests.
+#   1. Start from the same base pattern as generate_puzzle.
+#   2. Apply K random band/stack + row/col permutations and K symbol permutations at once.
+#   3. Blank exactly count_blanks(N*N, difficulty) cells per puzzle with batched masks.
+#   4. Return the puzzles as a (K, N, N) array, compact strings, or text blocks.
+#
+# Usage:
+#   pip install numpy
+#   python sudoku_bulk.py
+
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from BB_advancedsudoku4 import get_symbols, count_blanks, generate_puzzle, get_codec
+
+FORMATS = ('array', 'compact', 'text')
+
+def cell_dtype(N):
+    """
+    Smallest unsigned dtype that holds the symbol indices 0..N.
+    """
+    return np.uint8 if N < 256 else np.uint16
+
+# --- Batched permutations ---
+
+# Up to this many items a permutation is drawn from a table of all of them (8! = 40320 rows)
+TABLE_MAX = 8
+# Puzzles are generated in blocks of this many, each from its own random stream spawned from the
+# seed, so the output only depends on the seed (and K), not on how the work is batched
+BLOCK = 65536
+_perm_tables = {}
+
+def _perm_table(n):
+    """
+    (n!, n) array of every permutation of 0..n-1, built once per n.
+    """
+    if n not in _perm_tables:
+        table = np.zeros((1, 0), dtype=np.uint8)
+        for k in range(n):
+            # Insert item k at every position of every permutation of 0..k-1
+            rows = [np.insert(table, pos, k, axis=1) for pos in range(k + 1)]
+            table = np.concatenate(rows)
+        _perm_tables[n] = table
+    return _perm_tables[n]
+
+def _random_perms(rng, K, n):
+    """
+    Return a (K, n) array where each row is an independent uniform permutation of 0..n-1.
+    The first min(n, TABLE_MAX) items come from a table of all their permutations; every
+    further item i goes to a random slot j <= i and the item from j moves to the end
+    (inside-out Fisher-Yates, vectorized over the K rows).
+    """
+    m = min(n, TABLE_MAX)
+    table = _perm_table(m)
+    perms = np.empty((K, n), dtype=np.intp)
+    perms[:, :m] = table[rng.integers(0, table.shape[0], K)]
+    ks = np.arange(K)
+    for i in range(m, n):
+        j = rng.integers(0, i + 1, K)
+        perms[:, i] = perms[ks, j]
+        perms[ks, j] = i
+    return perms
+
+def _band_maps(rng, K, N, b):
+    """
+    Batched version of generate_puzzle's shuffle_band: shuffle the lines inside
+    each band, then shuffle the bands. Returns a (K, N) array of line indices.
+    """
+    band_order = _random_perms(rng, K, b)                           # (K, b)
+    within = _random_perms(rng, K*b, b).reshape(K, b, b)            # (K, b, b)
+    return (band_order[:, :, None] * b + within).reshape(K, N)
+
+# --- Generator ---
+
+def _blank_masks(rng, K, total, blanks):
+    """
+    (K, total) bool array, each row a uniform random set of exactly blanks cells.
+    """
+    masks = np.zeros((K, total), dtype=bool)
+    keys = rng.random((K, total), dtype=np.float32)
+    np.put_along_axis(masks, np.argpartition(keys, blanks - 1, axis=1)[:, :blanks], True, axis=1)
+    return masks
+
+def _generate_chunk(rng, N, difficulty, K, mask_pool=None):
+    """
+    Generate K puzzles as a (K, N, N) array (0 = blank, 1..N = symbol index).
+    """
+    b = int(N**0.5)
+    total = N*N
+    # The base pattern is base[r][c] = (start[r] + c) % N, so after the row/col shuffles and the
+    # symbol permutation cell (i, j) holds perm[(start[rows[i]] + cols[j]) % N]. Writing each
+    # puzzle's permutation twice over (2N entries) drops the % N, and the whole grid is one
+    # np.take with flat int32 indices (much faster than multi-array fancy indexing).
+    r = np.arange(N, dtype=np.int32)
+    start = b*(r % b) + r//b
+    rows = start[_band_maps(rng, K, N, b)] + (np.arange(K, dtype=np.int32) * (2*N))[:, None]
+    cols = _band_maps(rng, K, N, b).astype(np.int32)
+    # Symbol permutation, shifted so that 0 stays free for blanks
+    perm = (_random_perms(rng, K, N) + 1).astype(cell_dtype(N))
+    full = np.take(np.concatenate([perm, perm], axis=1).ravel(),
+                   rows[:, :, None] + cols[:, None, :]).reshape(K, total)
+
+    # Blank masks with the exact blank count: by default one independent mask per puzzle. With a
+    # mask_pool, every puzzle instead takes one of mask_pool masks at a random cyclic offset
+    # (rotating a uniform random set of cells keeps it uniform), read as a contiguous row out of
+    # a sliding window over the doubled pool.
+    blanks = count_blanks(total, difficulty)
+    if blanks and mask_pool is None:
+        full *= ~_blank_masks(rng, K, total, blanks)
+    elif blanks:
+        P = min(K, mask_pool)
+        pool = _blank_masks(rng, P, total, blanks)
+        windows = sliding_window_view(np.concatenate([pool, pool], axis=1), total, axis=1)
+        full *= ~windows[rng.integers(0, P, K), rng.integers(0, total, K)]
+    return full.reshape(K, N, N)
+
+def generate_puzzles(N, difficulty, K, seed=None, fmt='array', mask_pool=None):
+    """
+    Generate K NxN puzzles of difficulty 0-2 in one batch.
+    The same seed and K always produce the same puzzles.
+      fmt='array'   -> (K, N, N) array of symbol indices, 0 = blank (see cell_dtype)
+      fmt='compact' -> list of K strings, one symbol per cell, row-major, '0' = blank (N <= 35)
+      fmt='text'    -> list of K strings, N space-separated rows joined by newlines
+    mask_pool=None draws every puzzle's blank cells independently. An int P reuses P random
+    masks per block of BLOCK puzzles, each at a random cyclic offset: faster, but a block holds
+    at most P*N*N distinct blank patterns, so large corpora get repeated ones (about 9% of
+    200,000 9x9 puzzles at P=4096).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"'{fmt}' is not a valid format")
+    b = int(N**0.5)
+    if b*b != N:
+        raise ValueError(f"N={N} is not a perfect square")
+    starts = range(0, K, BLOCK)
+    streams = np.random.SeedSequence(seed).spawn(len(starts))
+    chunks = []
+    for stream, start in zip(streams, starts):
+        chunks.append(_generate_chunk(np.random.default_rng(stream), N, difficulty,
+                                      min(BLOCK, K - start), mask_pool))
+    arr = np.concatenate(chunks) if chunks else np.zeros((0, N, N), dtype=cell_dtype(N))
+    if fmt == 'array':
+        return arr
+    return to_strings(arr, fmt)
+
+# --- Output formats ---
+
+def to_strings(arr, fmt='compact'):
+    """
+    Convert a (K, N, N) puzzle array into compact or text strings.
+    """
+    K, N, _ = arr.shape
+    symbols = get_symbols(N)
+    if any(len(sym) > 1 for sym in symbols):
+        # Multi-character tokens (N > 35): only the text format can hold them
+        if fmt != 'text':
+            raise ValueError(f"'{fmt}' format needs single-character symbols (N <= 35)")
+        tokens = ['0'] + symbols
+        return ['\n'.join(' '.join(tokens[v] for v in row) for row in p) for p in arr.tolist()]
+    table = np.frombuffer(('0' + ''.join(symbols)).encode(), dtype=np.uint8)
+    chars = table[arr]                                            # (K, N, N)
+    if fmt == 'compact':
+        width = N*N
+        buf = chars.reshape(K, width).tobytes()
+    elif fmt == 'text':
+        # Interleave each symbol with a separator: ' ' inside a row, '\n' at row end
+        out = np.empty((K, N, N, 2), dtype=np.uint8)
+        out[..., 0] = chars
+        out[..., 1] = ord(' ')
+        out[:, :, -1, 1] = ord('\n')
+        width = N*N*2 - 1
+        buf = out.reshape(K, width + 1)[:, :width].tobytes()
+    else:
+        raise ValueError(f"'{fmt}' is not a valid format")
+    text = buf.decode('ascii')
+    return [text[k*width:(k+1)*width] for k in range(K)]
+
+def to_grid(arr_puzzle, codec=None):
+    """
+    Convert one (N, N) array puzzle into the solver's list-of-lists grid.
+    """
+    if codec is None:
+        codec = get_codec(len(arr_puzzle))
+    return codec.decode(arr_puzzle.tolist())
+
+# --- Throughput check against the per-puzzle path ---
+
+def main():
+    N, difficulty, K = 9, 1, 200000
+    single_runs = 5000
+    t0 = time.perf_counter()
+    for _ in range(single_runs):
+        generate_puzzle(N, difficulty)
+    single = single_runs / (time.perf_counter() - t0)
+    print(f"generate_puzzle:  {single:,.0f} puzzles/s")
+
+    for fmt, mask_pool in (('array', None), ('compact', None), ('array', 4096)):
+        t0 = time.perf_counter()
+        arr = generate_puzzles(N, difficulty, K, seed=0, fmt=fmt, mask_pool=mask_pool)
+        bulk = K / (time.perf_counter() - t0)
+        line = f"generate_puzzles: {bulk:,.0f} puzzles/s as {fmt} ({bulk/single:.0f}x)"
+        if fmt == 'array':
+            masks = len(np.unique(np.packbits(arr.reshape(K, -1) == 0, axis=1), axis=0))
+            line += f", mask_pool={mask_pool}: {masks:,} distinct blank masks"
+        print(line)
+
+if __name__ == "__main__":
+    main()
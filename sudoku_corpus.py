@@ -0,0 +1,224 @@
+# sudoku_corpus.py
+# --------------------------------------
+# Packed binary puzzle corpus with memory-mapped random access.
+#
+# File layout (all integers little-endian):
+#   header   : magic b'SDKC', version, N, bits per cell, flags, record size, count,
+#              and an offset index giving where each section starts
+#   puzzles  : count fixed-width records
+#   solutions: count fixed-width records (only if flags & HAS_SOLUTIONS)
+#
+# A record holds N*N cells in row-major order, cell k stored in bits [k*bits, (k+1)*bits)
+# of a little-endian integer, with bits = ceil(log2(N+1)) (0 = blank, 1..N = symbol index).
+# A 9×9 puzzle takes 41 bytes instead of ~160 bytes of text or a few KiB of list[list[str]].
+# Records are fixed width, so record i sits at section_offset + i*record_size.
+#
+# Usage:
+#   python sudoku_corpus.py
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from BB_advancedsudoku4 import get_codec, generate_puzzle
+
+MAGIC = b'SDKC'
+VERSION = 1
+HAS_SOLUTIONS = 1
+# magic, version, N, bits, flags, record_bytes, count, puzzles_offset, solutions_offset
+HEADER = struct.Struct('<4sHHBBIQQQ')
+
+# --- Bit packing ---
+
+def cell_bits(N):
+    """
+    Bits needed for one cell holding 0..N.
+    """
+    return N.bit_length()
+
+def record_size(N):
+    """
+    Bytes per packed N×N record.
+    """
+    return (N*N*cell_bits(N) + 7) // 8
+
+def pack_grid(g, N):
+    """
+    Pack an N×N grid of symbol indices (ints 0..N) into one record.
+    """
+    bits = cell_bits(N)
+    value, shift = 0, 0
+    for row in g:
+        for v in row:
+            value |= v << shift
+            shift += bits
+    return value.to_bytes(record_size(N), 'little')
+
+def unpack_grid(data, N):
+    """
+    Unpack one record back into an N×N list of symbol indices.
+    """
+    bits = cell_bits(N)
+    mask = (1 << bits) - 1
+    value = int.from_bytes(data, 'little')
+    g = []
+    for _ in range(N):
+        row = []
+        for _ in range(N):
+            row.append(value & mask)
+            value >>= bits
+        g.append(row)
+    return g
+
+# --- Writer ---
+
+def _as_rows(p):
+    # numpy arrays (ex. from sudoku_bulk) -> plain lists of ints
+    return p.tolist() if hasattr(p, 'tolist') else p
+
+def write_corpus(path, puzzles, N, solutions=None, codec=None):
+    """
+    Write puzzles (and optionally matching solutions) to a packed corpus file.
+    puzzles/solutions can be any iterables of grids in the solver's grid type;
+    records are streamed, so the corpus never has to fit in memory.
+    Returns the number of puzzles written.
+    """
+    rec = record_size(N)
+    flags = HAS_SOLUTIONS if solutions is not None else 0
+    with open(path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        count = 0
+        for p in puzzles:
+            p = _as_rows(p)
+            c = codec or get_codec(N, p)
+            f.write(pack_grid(c.encode(p), N))
+            count += 1
+        puzzles_offset = HEADER.size
+        solutions_offset = 0
+        if solutions is not None:
+            solutions_offset = f.tell()
+            written = 0
+            for s in solutions:
+                s = _as_rows(s)
+                c = codec or get_codec(N, s)
+                f.write(pack_grid(c.encode(s), N))
+                written += 1
+            if written != count:
+                raise ValueError(f"Got {written} solutions for {count} puzzles")
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, N, cell_bits(N), flags, rec, count,
+                            puzzles_offset, solutions_offset))
+    return count
+
+# --- Reader ---
+
+class Corpus:
+    """
+    Memory-mapped view of a corpus file. Opening only reads the header; records are
+    decoded on access:
+        with Corpus('puzzles.sdk') as corpus:
+            S = corpus[123]           # one grid
+            batch = corpus[1000:2000] # list of grids
+            R = corpus.solution(123)
+    Grids come back through codec (default: get_symbols(N) tokens).
+    """
+    def __init__(self, path, codec=None):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a corpus file") from None
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a corpus file")
+        (magic, version, self.N, self.bits, flags, self.record_bytes, self.count,
+         self._puzzles_offset, self._solutions_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a corpus file")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported corpus version {version}")
+        if self.bits != cell_bits(self.N) or self.record_bytes != record_size(self.N):
+            self.close()
+            raise ValueError(f"{path} has {self.bits}-bit cells in {self.record_bytes}-byte records, "
+                             f"expected {cell_bits(self.N)} and {record_size(self.N)} for N={self.N}")
+        self.has_solutions = bool(flags & HAS_SOLUTIONS)
+        # Every section must hold all count records, or a cut-off file would read as blanks
+        sections = (self._puzzles_offset, self._solutions_offset) if self.has_solutions \
+            else (self._puzzles_offset,)
+        for offset in sections:
+            if offset + self.count*self.record_bytes > len(self._mm):
+                self.close()
+                raise ValueError(f"{path} is truncated: too short for {self.count} records")
+        self.codec = codec or get_codec(self.N)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def _record(self, offset, i):
+        if not 0 <= i < self.count:
+            raise IndexError(f"record {i} out of range for a corpus of {self.count}")
+        start = offset + i*self.record_bytes
+        return self._mm[start:start + self.record_bytes]
+
+    def raw(self, i):
+        """
+        Puzzle i as an N×N list of symbol indices (0 = blank), skipping the codec.
+        """
+        if i < 0:
+            i += self.count
+        return unpack_grid(self._record(self._puzzles_offset, i), self.N)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self.count))]
+        return self.codec.decode(self.raw(i))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def solution(self, i):
+        """
+        Solution to puzzle i (needs a corpus written with solutions).
+        """
+        if not self.has_solutions:
+            raise ValueError("corpus was written without solutions")
+        if i < 0:
+            i += self.count
+        return self.codec.decode(unpack_grid(self._record(self._solutions_offset, i), self.N))
+
+# --- Size / open-time check ---
+
+def main():
+    N, K = 9, 20000
+    puzzles = [generate_puzzle(N, 1) for _ in range(K)]
+    path = os.path.join(tempfile.gettempdir(), 'sudoku_corpus_demo.sdk')
+    write_corpus(path, puzzles, N)
+    t0 = time.perf_counter()
+    with Corpus(path) as corpus:
+        opened = time.perf_counter() - t0
+        assert corpus[K//2] == puzzles[K//2] and corpus[-1] == puzzles[-1]
+        text = sum(len(' '.join(row)) + 1 for row in puzzles[0])
+        print(f"{K} puzzles of {N}×{N}: {os.path.getsize(path):,} bytes on disk "
+              f"({corpus.record_bytes} bytes/puzzle vs {text} as text), opened in {opened*1e3:.2f} ms")
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# sudoku_rating.py
+# --------------------------------------
+# Difficulty rating by how a puzzle actually gets solved, instead of its blank ratio.
+#   1. Solve with human-style inference rules, always using the easiest rule that makes
+#      progress (see WEIGHTS): naked singles, hidden singles, locked candidates, naked pairs.
+#   2. When no rule applies, branch on the cell with the fewest candidates and keep going
+#      with the rules inside every branch.
+#   3. Score = weight of the hardest technique needed + log10(1 + search branches),
+#      and the tier comes from the score (see TIERS).
+# rate_batch() spreads a batch over a process pool for labelling whole corpora.
+#
+# Usage:
+#   python sudoku_rating.py [count]     (rates generated 9×9 puzzles of every difficulty)
+
+import math
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from BB_advancedsudoku4 import get_codec, get_units, generate_puzzle
+
+# Technique -> weight, easiest first (also the order the rules are tried in)
+WEIGHTS = {
+    'naked_single': 1.0,        # a cell with one candidate left
+    'hidden_single': 1.5,       # a value with one place left in a row/column/box
+    'locked_candidates': 2.5,   # a value confined to where a box meets a line
+    'naked_pair': 3.0,          # two cells of a unit with the same two candidates
+    'branch': 4.0,              # trial and error
+}
+# (highest score, tier): easy = singles only, medium = needs line/box or pair eliminations,
+# hard = a handful of guesses, expert = real search
+TIERS = ((1.5, 'easy'), (3.0, 'medium'), (5.0, 'hard'), (math.inf, 'expert'))
+MAX_BRANCHES = 100000
+
+# --- Lookup tables ---
+
+# Per N: every box/line intersection as (cells, rest of the box, rest of the line)
+_segments = {}
+
+def get_segments(N):
+    if N not in _segments:
+        units, unit_of = get_units(N)
+        segments = []
+        for k in range(N):
+            box = set(units[2*N + k])
+            for line in {unit_of[c][0] for c in box} | {unit_of[c][1] for c in box}:
+                seg = box & set(units[line])
+                segments.append((tuple(sorted(seg)), tuple(sorted(box - seg)),
+                                 tuple(c for c in units[line] if c not in seg)))
+        _segments[N] = tuple(segments)
+    return _segments[N]
+
+def tier_of(score):
+    for top, name in TIERS:
+        if score <= top:
+            return name
+
+# --- Rule-based solver ---
+
+class _TooHard(Exception):
+    pass
+
+class _Rater:
+    """
+    Candidate bitmasks per flat cell (0 once the cell is filled) and the filled values,
+    plus counters of every technique used.
+    """
+    def __init__(self, g, N, max_branches):
+        self.N = N
+        self.units, self.unit_of = get_units(N)
+        self.segments = get_segments(N)
+        self.full = (1 << N) - 1
+        self.max_branches = max_branches
+        self.used = Counter()
+        self.branches = 0
+        self.val = [v for row in g for v in row]
+        self.cand = [0 if v else self.full for v in self.val]
+
+    def start(self):
+        # Clues remove their value from every peer; clashing clues make the puzzle invalid
+        used = [0]*len(self.units)
+        for c, v in enumerate(self.val):
+            if v:
+                bit = 1 << (v - 1)
+                for u in self.unit_of[c]:
+                    if used[u] & bit:
+                        return False
+                    used[u] |= bit
+        for c, v in enumerate(self.val):
+            if not v:
+                r, col, bx = self.unit_of[c]
+                self.cand[c] = self.full & ~(used[r] | used[col] | used[bx])
+        return True
+
+    def assign(self, c, v):
+        self.val[c] = v
+        self.cand[c] = 0
+        bit = 1 << (v - 1)
+        cand, units = self.cand, self.units
+        r, col, bx = self.unit_of[c]
+        for p in units[r] + units[col] + units[bx]:
+            if cand[p] & bit:
+                cand[p] ^= bit
+                if not cand[p]:
+                    return False
+        return True
+
+    def naked_singles(self):
+        found = 0
+        val, cand = self.val, self.cand
+        for c in range(len(val)):
+            m = cand[c]
+            if m and not m & (m - 1):
+                if not self.assign(c, m.bit_length()):
+                    return None
+                found += 1
+            elif not m and not val[c]:
+                return None
+        return found
+
+    def hidden_singles(self):
+        found = 0
+        val, cand = self.val, self.cand
+        for cells in self.units:
+            once = twice = placed = 0
+            for c in cells:
+                m = cand[c]
+                twice |= once & m
+                once |= m
+                if val[c]:
+                    placed |= 1 << (val[c] - 1)
+            if (once | placed) != self.full:
+                return None
+            only = once & ~twice
+            while only:
+                bit = only & -only
+                only ^= bit
+                for c in cells:
+                    if cand[c] & bit:
+                        if cand[c] & ~bit & only:
+                            return None     # two values that can only go in the same cell
+                        if not self.assign(c, bit.bit_length()):
+                            return None
+                        found += 1
+                        break
+        return found
+
+    def locked_candidates(self):
+        cand = self.cand
+        for seg, box_rest, line_rest in self.segments:
+            inside = 0
+            for c in seg:
+                inside |= cand[c]
+            if not inside:
+                continue
+            in_box = in_line = 0
+            for c in box_rest:
+                in_box |= cand[c]
+            for c in line_rest:
+                in_line |= cand[c]
+            # Values the box can only put here leave the rest of the line, and the other way round
+            removed = False
+            for drop, cells in ((inside & ~in_box & in_line, line_rest),
+                                (inside & ~in_line & in_box, box_rest)):
+                if drop:
+                    for c in cells:
+                        cand[c] &= ~drop
+                    removed = True
+            if removed:
+                return 1
+        return 0
+
+    def naked_pairs(self):
+        cand = self.cand
+        for cells in self.units:
+            seen = set()
+            for c in cells:
+                m = cand[c]
+                if m and bin(m).count('1') == 2:
+                    if m in seen:
+                        removed = False
+                        for p in cells:
+                            if cand[p] != m and cand[p] & m:
+                                cand[p] &= ~m
+                                removed = True
+                        if removed:
+                            return 1
+                    seen.add(m)
+        return 0
+
+    def logic(self):
+        """
+        Apply the rules, easiest first, until none makes progress.
+        Returns False on a contradiction.
+        """
+        rules = ((self.naked_singles, 'naked_single'), (self.hidden_singles, 'hidden_single'),
+                 (self.locked_candidates, 'locked_candidates'), (self.naked_pairs, 'naked_pair'))
+        while True:
+            for rule, name in rules:
+                found = rule()
+                if found is None:
+                    return False
+                if found:
+                    self.used[name] += found
+                    break
+            else:
+                return True
+
+    def solve(self):
+        if not self.logic():
+            return False
+        open_cells = [c for c, m in enumerate(self.cand) if m]
+        if not open_cells:
+            return True
+        # Branch on the cell with the fewest candidates
+        c = min(open_cells, key=lambda c: bin(self.cand[c]).count('1'))
+        m = self.cand[c]
+        while m:
+            bit = m & -m
+            m ^= bit
+            self.branches += 1
+            if self.branches > self.max_branches:
+                raise _TooHard
+            saved = self.cand[:], self.val[:]
+            if self.assign(c, bit.bit_length()) and self.solve():
+                return True
+            self.cand, self.val = saved
+        return False
+
+# --- Rating ---
+
+def rate(S, N, codec=None, max_branches=MAX_BRANCHES):
+    """
+    Rate puzzle S (solver grid type). Returns a dict:
+      score (float, None if the puzzle has no solution), tier ('easy', 'medium', 'hard',
+      'expert' or 'invalid'), hardest (technique), techniques ({technique: times used}),
+      branches (search branches tried), solved (False if unsolvable or cut off at max_branches)
+    """
+    codec = codec or get_codec(N, S)
+    r = _Rater(codec.encode(S), N, max_branches)
+    try:
+        solved = r.start() and r.solve()
+    except _TooHard:
+        solved = None
+    techniques = dict(r.used)
+    if r.branches:
+        techniques['branch'] = r.branches
+    if solved is False:
+        return {'score': None, 'tier': 'invalid', 'hardest': None, 'techniques': techniques,
+                'branches': r.branches, 'solved': False}
+    hardest = max(techniques, key=WEIGHTS.get) if techniques else 'naked_single'
+    score = round(WEIGHTS[hardest] + math.log10(1 + r.branches), 3)
+    # Cut off at max_branches: the score is only a lower bound, but it is expert either way
+    return {'score': score, 'tier': tier_of(score) if solved else 'expert', 'hardest': hardest,
+            'techniques': techniques, 'branches': r.branches, 'solved': bool(solved)}
+
+def _rate_job(job):
+    S, N, max_branches = job
+    return rate(S, N, max_branches=max_branches)
+
+def rate_batch(puzzles, N, workers=None, chunk=256, max_branches=MAX_BRANCHES):
+    """
+    Rate many puzzles across a process pool of workers (default: one per core;
+    workers=1 rates in this process).
+    Returns the ratings in the same order as puzzles.
+    """
+    jobs = ((S, N, max_branches) for S in puzzles)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_rate_job(job) for job in jobs]
+    with Pool(workers) as pool:
+        return list(pool.imap(_rate_job, jobs, chunksize=chunk))
+
+# --- Blank ratio vs rated tier ---
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    N = 9
+    for difficulty in (0, 1, 2):
+        puzzles = [generate_puzzle(N, difficulty) for _ in range(count)]
+        t0 = time.perf_counter()
+        ratings = rate_batch(puzzles, N)
+        elapsed = time.perf_counter() - t0
+        tiers = Counter(r['tier'] for r in ratings)
+        scores = [r['score'] for r in ratings if r['score'] is not None]
+        print(f"difficulty {difficulty}: mean score {sum(scores) / len(scores):.2f}, "
+              + ", ".join(f"{name} {tiers[name]}" for _, name in TIERS)
+              + f" ({count / elapsed:,.0f} puzzles/s on {os.cpu_count()} cores)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+# sudoku_sat.py
+# --------------------------------------
+# SAT backend for hard and oversized puzzles (strategy 'sat' in BB_advancedsudoku4).
+#   1. Encode the puzzle as CNF: every cell holds exactly one value and every
+#      row/col/box holds every value exactly once; clues are unit clauses.
+#   2. Solve the CNF with a small conflict-driven clause-learning (CDCL) engine:
+#      two-watched-literal propagation, first-UIP clause learning with
+#      non-chronological backjumping, VSIDS-style variable activity, phase saving
+#      and Luby restarts.
+#   3. Decode the model back into the grid.
+# The CNF can also be written as DIMACS to compare against external solvers.
+#
+# Usage:
+#   python sudoku_sat.py [out.cnf]     (solves a generated hard 16×16, optionally exports it)
+
+import heapq
+import sys
+import time
+
+from BB_advancedsudoku4 import get_codec, get_tables, generate_puzzle
+
+# --- CNF encoding ---
+
+def encode(g, N, reduce=True):
+    """
+    Encode an N×N grid of symbol indices (0 = blank) as CNF.
+    Returns (num_vars, clauses, var_of) where var_of[(i, j, v)] is the variable for
+    "cell (i,j) holds v". With reduce=False every (i, j, v) gets the variable
+    (i*N + j)*N + v, which is the usual numbering for external tools.
+    With reduce=True values ruled out directly by a clue get no variable at all,
+    and constraints already met by a clue are left out, which keeps large grids small.
+    """
+    box_id, box_cells = get_tables(N)
+    units = ([[(i, j) for j in range(N)] for i in range(N)] +
+             [[(i, j) for i in range(N)] for j in range(N)] +
+             [list(cells) for cells in box_cells])
+    placed = [set() for _ in units]
+    unit_of = {}
+    for u, cells in enumerate(units):
+        for cell in cells:
+            unit_of.setdefault(cell, []).append(u)
+            if g[cell[0]][cell[1]]:
+                placed[u].add(g[cell[0]][cell[1]])
+
+    var_of = {}
+    for i in range(N):
+        for j in range(N):
+            if g[i][j] and reduce:
+                cand = [g[i][j]]
+            elif reduce:
+                taken = set().union(*(placed[u] for u in unit_of[(i, j)]))
+                cand = [v for v in range(1, N + 1) if v not in taken]
+            else:
+                cand = range(1, N + 1)
+            for v in cand:
+                var_of[(i, j, v)] = (i*N + j)*N + v if not reduce else len(var_of) + 1
+    num_vars = N*N*N if not reduce else len(var_of)
+
+    clauses = []
+    def exactly_one(lits):
+        clauses.append(lits)
+        for a in range(len(lits)):
+            for b in range(a + 1, len(lits)):
+                clauses.append([-lits[a], -lits[b]])
+
+    # Clues
+    for i in range(N):
+        for j in range(N):
+            if g[i][j]:
+                clauses.append([var_of[(i, j, g[i][j])]])
+    # Every cell holds exactly one value
+    for i in range(N):
+        for j in range(N):
+            if reduce and g[i][j]:
+                continue
+            exactly_one([var_of[(i, j, v)] for v in range(1, N + 1) if (i, j, v) in var_of])
+    # Every row/col/box holds every value exactly once
+    for u, cells in enumerate(units):
+        for v in range(1, N + 1):
+            if reduce and v in placed[u]:
+                continue
+            exactly_one([var_of[(i, j, v)] for i, j in cells if (i, j, v) in var_of])
+    return num_vars, clauses, var_of
+
+def write_dimacs(num_vars, clauses, path, comment=None):
+    """
+    Write CNF in DIMACS format.
+    """
+    with open(path, 'w') as f:
+        if comment:
+            for line in comment.splitlines():
+                f.write(f"c {line}\n")
+        f.write(f"p cnf {num_vars} {len(clauses)}\n")
+        for c in clauses:
+            f.write(' '.join(map(str, c)) + ' 0\n')
+
+def export_dimacs(S, N, path, codec=None):
+    """
+    Write puzzle S (solver grid type) as DIMACS, using the full (i*N + j)*N + v numbering
+    so a model from an external solver can be read back without a variable map.
+    """
+    codec = codec or get_codec(N, S)
+    num_vars, clauses, _ = encode(codec.encode(S), N, reduce=False)
+    write_dimacs(num_vars, clauses, path,
+                 comment=f"sudoku {N}x{N}\nvar (i*{N} + j)*{N} + v = cell (i,j) holds symbol v (0-based i,j; v in 1..{N})")
+
+# --- CDCL engine ---
+
+def _luby(i):
+    # i-th element (1-based) of the Luby sequence 1,1,2,1,1,2,4,...
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+class CDCL:
+    """
+    Conflict-driven clause-learning SAT solver over DIMACS-style clauses
+    (lists of non-zero ints, -v = not v).
+    """
+    RESTART_BASE = 100
+    VAR_DECAY = 0.95
+    CLOCK_DECISIONS = 64    # decisions between deadline checks when there are no conflicts
+
+    def __init__(self, num_vars, clauses):
+        n = num_vars
+        self.n = n
+        self.value = [0]*(n + 1)        # 1 true, -1 false, 0 unassigned
+        self.level = [0]*(n + 1)
+        self.reason = [None]*(n + 1)    # index of the clause that implied the var
+        self.activity = [0.0]*(n + 1)
+        self.phase = [1]*(n + 1)        # saved polarity; start with "cell holds v"
+        self.var_inc = 1.0
+        self.clauses = []
+        self.watches = [[] for _ in range(2*n + 2)]
+        self.trail, self.trail_lim = [], []
+        self.qhead = 0
+        self.ok = True
+        self.conflicts = self.decisions = self.propagations = self.restarts = self.learnt = 0
+        self.live_learnts = 0
+        for c in clauses:
+            self.add_clause(c)
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        # Learnt clauses live after the original ones; once there are more than max_learnts
+        # the longer half of them is dropped
+        self.first_learnt = len(self.clauses)
+        self.max_learnts = max(1000, len(self.clauses) // 3)
+
+    @staticmethod
+    def _w(lit):
+        # watch list slot for a literal
+        return 2*lit if lit > 0 else 1 - 2*lit
+
+    def _val(self, lit):
+        v = self.value[lit if lit > 0 else -lit]
+        return v if lit > 0 else -v
+
+    def add_clause(self, c):
+        c = list(dict.fromkeys(c))
+        if any(-l in c for l in c):
+            return    # always true
+        if not c:
+            self.ok = False
+        elif len(c) == 1:
+            val = self._val(c[0])
+            if val == -1:
+                self.ok = False
+            elif val == 0:
+                self._enqueue(c[0], None)
+        else:
+            self.clauses.append(c)
+            ci = len(self.clauses) - 1
+            self.watches[self._w(c[0])].append(ci)
+            self.watches[self._w(c[1])].append(ci)
+
+    def _enqueue(self, lit, reason):
+        var = lit if lit > 0 else -lit
+        self.value[var] = 1 if lit > 0 else -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    # Two-watched-literal unit propagation; returns a conflicting clause index or None
+    def propagate(self):
+        value, clauses, watches, trail = self.value, self.clauses, self.watches, self.trail
+        w = self._w
+        while self.qhead < len(trail):
+            p = trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            false_lit = -p
+            ws = watches[w(false_lit)]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c is None:
+                    continue    # deleted learnt clause
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], false_lit
+                first = c[0]
+                fv = value[first] if first > 0 else -value[-first]
+                if fv == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                # Look for a new literal to watch instead of false_lit
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    if (value[lit] if lit > 0 else -value[-lit]) != -1:
+                        c[1], c[k] = lit, false_lit
+                        watches[w(lit)].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if fv == -1:
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        return ci
+                    self._enqueue(first, ci)
+            del ws[j:]
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.n + 1) if not self.value[v]]
+            heapq.heapify(self.heap)
+        elif not self.value[var]:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    # First-UIP conflict analysis; returns (learnt clause, backjump level)
+    def analyze(self, confl):
+        seen = set()
+        learnt = [None]
+        counter = 0
+        p = None
+        index = len(self.trail) - 1
+        cur = len(self.trail_lim)
+        c = self.clauses[confl]
+        while True:
+            for q in (c if p is None else c[1:]):
+                var = abs(q)
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.level[var] >= cur:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            p = self.trail[index]
+            index -= 1
+            seen.discard(abs(p))
+            counter -= 1
+            if counter == 0:
+                break
+            c = self.clauses[self.reason[abs(p)]]
+        learnt[0] = -p
+        # Drop literals implied by the rest of the clause (their whole reason is already in it)
+        level, reason, clauses = self.level, self.reason, self.clauses
+        learnt[1:] = [q for q in learnt[1:]
+                      if reason[abs(q)] is None or
+                      any(abs(r) not in seen and level[abs(r)] > 0 for r in clauses[reason[abs(q)]][1:])]
+        if len(learnt) == 1:
+            return learnt, 0
+        # Watch the literal from the highest remaining level second
+        k = max(range(1, len(learnt)), key=lambda x: self.level[abs(learnt[x])])
+        learnt[1], learnt[k] = learnt[k], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    # Delete the longer half of the learnt clauses (keeping any that are the reason for
+    # a current assignment); their watch entries are dropped lazily by propagate
+    def reduce_learnts(self):
+        locked = {self.reason[abs(lit)] for lit in self.trail}
+        live = [ci for ci in range(self.first_learnt, len(self.clauses))
+                if self.clauses[ci] is not None and ci not in locked]
+        live.sort(key=lambda ci: len(self.clauses[ci]))
+        for ci in live[len(live)//2:]:
+            if len(self.clauses[ci]) > 2:
+                self.clauses[ci] = None
+        self.max_learnts = int(self.max_learnts * 1.1)
+
+    def cancel_until(self, lvl):
+        if len(self.trail_lim) <= lvl:
+            return
+        start = self.trail_lim[lvl]
+        for lit in self.trail[start:]:
+            var = abs(lit)
+            self.phase[var] = self.value[var]
+            self.value[var] = 0
+            self.reason[var] = None
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[lvl:]
+        self.qhead = len(self.trail)
+
+    def _pick(self):
+        heap, value = self.heap, self.value
+        while heap:
+            _, var = heapq.heappop(heap)
+            if not value[var]:
+                return var
+        return None
+
+    def solve(self, time_limit=None):
+        """
+        Returns True (satisfiable, see model()), False (unsatisfiable) or None (time ran out).
+        """
+        if not self.ok or self.propagate() is not None:
+            return False
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        if time_limit is not None and time_limit <= 0:
+            return None
+        restart_at = self.RESTART_BASE * _luby(1)
+        since_restart = 0
+        while True:
+            confl = self.propagate()
+            if confl is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.trail_lim:
+                    return False
+                learnt, lvl = self.analyze(confl)
+                self.cancel_until(lvl)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.clauses.append(learnt)
+                    self.learnt += 1
+                    self.live_learnts += 1
+                    ci = len(self.clauses) - 1
+                    self.watches[self._w(learnt[0])].append(ci)
+                    self.watches[self._w(learnt[1])].append(ci)
+                    self._enqueue(learnt[0], ci)
+                self.var_inc /= self.VAR_DECAY
+                # A conflict costs far more than reading the clock, so check after every one
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None
+                if self.live_learnts > self.max_learnts:
+                    self.reduce_learnts()
+                    self.live_learnts = sum(c is not None for c in self.clauses[self.first_learnt:])
+                if since_restart >= restart_at:
+                    self.restarts += 1
+                    since_restart = 0
+                    restart_at = self.RESTART_BASE * _luby(self.restarts + 1)
+                    self.cancel_until(0)
+            else:
+                var = self._pick()
+                if var is None:
+                    return True
+                self.decisions += 1
+                if (deadline is not None and self.decisions % self.CLOCK_DECISIONS == 0
+                        and time.perf_counter() > deadline):
+                    return None
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(var if self.phase[var] > 0 else -var, None)
+
+    def model(self):
+        return [v for v in range(1, self.n + 1) if self.value[v] == 1]
+
+# --- Solver entry point ---
+
+def solve_sat(g, N, time_limit=None, stats=None):
+    """
+    Solve the N×N grid of symbol indices g in place with the CDCL engine.
+    Returns True if solved; stats (optional dict) gets sat/conflicts/decisions/... counts.
+    """
+    t0 = time.perf_counter()
+    num_vars, clauses, var_of = encode(g, N)
+    solver = CDCL(num_vars, clauses)
+    # Encoding and setting up watches already take a good part of a second on large grids,
+    # so they count against time_limit too
+    if time_limit is not None:
+        time_limit = max(0.0, time_limit - (time.perf_counter() - t0))
+    result = solver.solve(time_limit)
+    if result:
+        value = solver.value
+        for (i, j, v), var in var_of.items():
+            if value[var] == 1:
+                g[i][j] = v
+    if stats is not None:
+        stats.update(sat=result, variables=num_vars, clauses=len(clauses),
+                     conflicts=solver.conflicts, decisions=solver.decisions,
+                     propagations=solver.propagations, restarts=solver.restarts,
+                     learnt=solver.learnt)
+    return bool(result)
+
+def main():
+    from BB_advancedsudoku4 import BB_advancedsudoku4
+    N = 16
+    S = generate_puzzle(N, 2)
+    if len(sys.argv) > 1:
+        export_dimacs(S, N, sys.argv[1])
+    stats = {}
+    t0 = time.perf_counter()
+    R = BB_advancedsudoku4(S, N, 'sat', stats=stats)
+    print(f"{N}×{N} hard solved={all('0' not in row for row in R)} in "
+          f"{time.perf_counter() - t0:.3f}s: {stats}")
+
+if __name__ == "__main__":
+    main()
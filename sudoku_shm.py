@@ -0,0 +1,131 @@
+# sudoku_shm.py
+# --------------------------------------
+# Parallel batch solving over shared memory.
+#   1. The parent writes every puzzle once into a multiprocessing.shared_memory block,
+#      one byte per cell (symbol index, 0 = blank).
+#   2. Workers attach to the block when they start and only ever receive (start, stop)
+#      index ranges, so no puzzle or solution is pickled.
+#   3. Each worker writes its solutions and a solved flag per puzzle back in place.
+#
+# Block layout for K puzzles of N×N (cells = N*N):
+#   [0, K*cells)             puzzles
+#   [K*cells, 2*K*cells)     solutions
+#   [2*K*cells, 2*K*cells+K) solved flags (1 = every cell filled)
+#
+# Usage:
+#   python sudoku_shm.py
+
+import os
+import time
+from multiprocessing import Pool, shared_memory
+
+from BB_advancedsudoku4 import BB_advancedsudoku4, IntCodec, get_codec, generate_puzzle
+
+# Set in each worker by _attach
+_shm = None
+_job = None
+
+def _attach(name, K, N, C, kwargs):
+    global _shm, _job
+    _shm = shared_memory.SharedMemory(name=name)
+    _job = (K, N, C, kwargs, IntCodec(N))
+
+def _solve_range(bounds):
+    start, stop = bounds
+    K, N, C, kwargs, codec = _job
+    cells = N*N
+    buf = _shm.buf
+    solved = 0
+    for k in range(start, stop):
+        off = k*cells
+        S = [list(buf[off + i*N:off + (i+1)*N]) for i in range(N)]
+        R = BB_advancedsudoku4(S, N, C, codec=codec, verbose=False, **kwargs)
+        out = (K + k)*cells
+        buf[out:out + cells] = bytes(v for row in R for v in row)
+        ok = all(0 not in row for row in R)
+        buf[2*K*cells + k] = ok
+        solved += ok
+    return solved
+
+def solve_buffer(data, K, N, C, workers=None, chunk=None, **kwargs):
+    """
+    Solve K N×N puzzles given as K*N*N bytes of symbol indices (ex. arr.tobytes() from
+    sudoku_bulk) with strategy C across a process pool.
+    Extra keyword arguments go to BB_advancedsudoku4 (ex. time_limit). stats and trace are
+    rejected: they would only be filled inside the workers and never come back.
+    Returns (solutions as K*N*N bytes, list of K solved flags).
+    """
+    for name in ('stats', 'trace'):
+        if kwargs.get(name) is not None:
+            raise ValueError(f"'{name}' is not supported for shared-memory batches: "
+                             "it would only be filled inside the workers")
+    if N > 255:
+        raise ValueError("shared-memory batches store one byte per cell (N <= 255)")
+    cells = N*N
+    if len(data) != K*cells:
+        raise ValueError(f"Expected {K*cells} bytes for {K} puzzles of {N}x{N}, got {len(data)}")
+    if K == 0:
+        return b'', []
+    workers = workers or os.cpu_count() or 1
+    if chunk is None:
+        chunk = max(1, K // (workers*8))
+    shm = shared_memory.SharedMemory(create=True, size=2*K*cells + K)
+    try:
+        shm.buf[:K*cells] = data
+        ranges = [(s, min(s + chunk, K)) for s in range(0, K, chunk)]
+        with Pool(workers, initializer=_attach, initargs=(shm.name, K, N, C, kwargs)) as pool:
+            for _ in pool.imap_unordered(_solve_range, ranges):
+                pass
+        solutions = bytes(shm.buf[K*cells:2*K*cells])
+        flags = [bool(x) for x in shm.buf[2*K*cells:2*K*cells + K]]
+    finally:
+        shm.close()
+        shm.unlink()
+    return solutions, flags
+
+def solve_batch(puzzles, N, C, workers=None, chunk=None, codec=None, **kwargs):
+    """
+    Solve a list of puzzles (solver grid type) with strategy C across a process pool.
+    Extra keyword arguments are passed on as in solve_buffer.
+    Returns (list of solved grids in the same codec, list of solved flags).
+    """
+    puzzles = list(puzzles)
+    if not puzzles:
+        return [], []
+    codec = codec or get_codec(N, puzzles[0])
+    data = bytearray()
+    for S in puzzles:
+        for row in codec.encode(S):
+            data.extend(row)
+    solutions, flags = solve_buffer(bytes(data), len(puzzles), N, C, workers, chunk, **kwargs)
+    cells = N*N
+    grids = []
+    for k in range(len(puzzles)):
+        rec = solutions[k*cells:(k+1)*cells]
+        grids.append(codec.decode([list(rec[i*N:(i+1)*N]) for i in range(N)]))
+    return grids, flags
+
+# --- Comparison against pickling puzzles to workers ---
+
+def _solve_pickled(S):
+    return BB_advancedsudoku4(S, 9, 'dac', verbose=False)
+
+def main():
+    N, K = 9, 20000
+    puzzles = [generate_puzzle(N, 0) for _ in range(K)]
+
+    t0 = time.perf_counter()
+    with Pool() as pool:
+        pickled = pool.map(_solve_pickled, puzzles, chunksize=64)
+    t_pickled = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    shared, flags = solve_batch(puzzles, N, 'dac')
+    t_shared = time.perf_counter() - t0
+
+    assert shared == pickled and all(flags)
+    print(f"{K} easy {N}×{N} with dac on {os.cpu_count()} cores: "
+          f"pickled {K/t_pickled:,.0f}/s, shared memory {K/t_shared:,.0f}/s")
+
+if __name__ == "__main__":
+    main()
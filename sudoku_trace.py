@@ -0,0 +1,176 @@
+# sudoku_trace.py
+# --------------------------------------
+# Search-trace recording and replay for dac (and the dac fallback inside dp).
+#   1. Pass a SearchTrace as BB_advancedsudoku4(..., trace=t) to record the search.
+#      Without a trace the solver runs its normal, untraced search.
+#   2. Events are packed into a compact binary log (6 bytes each):
+#        expand    (cell, -, depth)      dac picked `cell` to branch on at `depth`
+#        assign    (cell, value, depth)  tried `value` in `cell`
+#        backtrack (cell, value, depth)  undid that value after its subtree failed
+#        propagate (cell, value, 0)      dp fixed `cell` by domain elimination
+#      cell = i*N + j, value = symbol index (1..N).
+#   3. summarize() replays a log into branching factor per depth, hot cells and the
+#      largest wasted (backtracked) subtrees.
+#
+# Usage:
+#   python sudoku_trace.py [trace_file]     (no file: trace a generated hard 9×9)
+
+import struct
+import sys
+from collections import Counter
+
+from BB_advancedsudoku4 import BB_advancedsudoku4, generate_puzzle
+
+EXPAND, ASSIGN, BACKTRACK, PROPAGATE = range(4)
+KIND_NAMES = ('expand', 'assign', 'backtrack', 'propagate')
+
+MAGIC = b'SDKT'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')   # magic, version, N
+EVENT = struct.Struct('<BHBH')    # kind, cell, value, depth
+
+# --- Recorder ---
+
+class SearchTrace:
+    """
+    Binary event log of one search. Called by the solver; see the module comment.
+    """
+    def __init__(self, N):
+        if N > 255:
+            raise ValueError("trace events store values in one byte (N <= 255)")
+        self.N = N
+        self.events = bytearray()
+        self._pack = EVENT.pack
+
+    def expand(self, cell, depth):
+        self.events += self._pack(EXPAND, cell, 0, depth)
+
+    def assign(self, cell, value, depth):
+        self.events += self._pack(ASSIGN, cell, value, depth)
+
+    def backtrack(self, cell, value, depth):
+        self.events += self._pack(BACKTRACK, cell, value, depth)
+
+    def propagate(self, cell, value):
+        self.events += self._pack(PROPAGATE, cell, value, 0)
+
+    def __len__(self):
+        return len(self.events) // EVENT.size
+
+    def __iter__(self):
+        """
+        Yields (kind, cell, value, depth) for every event in order.
+        """
+        return EVENT.iter_unpack(self.events)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.N))
+            f.write(self.events)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a trace file")
+        magic, version, N = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a trace file")
+        if version != VERSION:
+            raise ValueError(f"{path} has unsupported trace version {version}")
+        trace = cls(N)
+        trace.events = bytearray(data[HEADER.size:])
+        if len(trace.events) % EVENT.size:
+            raise ValueError(f"{path} ends in the middle of an event")
+        return trace
+
+# --- Replay ---
+
+def summarize(trace, top=10):
+    """
+    Replay a trace. Returns a dict with:
+      events, propagated, nodes (assignments), wasted (assignments later undone),
+      max_depth, per_depth: {depth: {'expands', 'assigns', 'backtracks', 'dead_ends', 'branching'}},
+      hot_cells: [((i, j), assigns, backtracks)], wasted_subtrees: [((i, j), value, depth, size)]
+    """
+    N = trace.N
+    per_depth = {}
+    assigns, backtracks = Counter(), Counter()
+    stack = []          # open assignments: (cell, value, depth, nodes before it)
+    pending = {}        # depth -> expand at that depth has not assigned anything yet
+    subtrees = []
+    nodes = propagated = 0
+
+    def level(d):
+        if d not in per_depth:
+            per_depth[d] = {'expands': 0, 'assigns': 0, 'backtracks': 0, 'dead_ends': 0}
+        return per_depth[d]
+
+    for kind, cell, value, depth in trace:
+        if kind == EXPAND:
+            level(depth)['expands'] += 1
+            pending[depth] = True
+        elif kind == ASSIGN:
+            level(depth)['assigns'] += 1
+            pending[depth] = False
+            assigns[cell] += 1
+            stack.append((cell, value, depth, nodes))
+            nodes += 1
+        elif kind == BACKTRACK:
+            level(depth)['backtracks'] += 1
+            backtracks[cell] += 1
+            # The child expand never found a valid value -> dead end one level down
+            if pending.get(depth + 1):
+                level(depth + 1)['dead_ends'] += 1
+                pending[depth + 1] = False
+            c, v, d, before = stack.pop()
+            subtrees.append((nodes - before, c, v, d))
+        elif kind == PROPAGATE:
+            propagated += 1
+    # Search that failed outright ends on an expand with nothing valid
+    for d, still in pending.items():
+        if still and (not stack or stack[-1][2] < d):
+            level(d)['dead_ends'] += 1
+
+    for stats in per_depth.values():
+        stats['branching'] = stats['assigns'] / stats['expands'] if stats['expands'] else 0.0
+    subtrees.sort(reverse=True)
+    hot = sorted(assigns, key=lambda c: (-assigns[c], c))[:top]
+    return {
+        'events': len(trace),
+        'propagated': propagated,
+        'nodes': nodes,
+        'wasted': nodes - len(stack),
+        'max_depth': max(per_depth) if per_depth else 0,
+        'per_depth': dict(sorted(per_depth.items())),
+        'hot_cells': [(divmod(c, N), assigns[c], backtracks[c]) for c in hot],
+        'wasted_subtrees': [(divmod(c, N), v, d, size) for size, c, v, d in subtrees[:top]],
+    }
+
+def print_summary(summary):
+    print(f"{summary['events']} events, {summary['propagated']} cells fixed by propagation, "
+          f"{summary['nodes']} search nodes, {summary['wasted']} wasted "
+          f"({summary['wasted'] / max(1, summary['nodes']) * 100:.1f}%), max depth {summary['max_depth']}")
+    print("\ndepth  expands  assigns  backtracks  dead_ends  branching")
+    for d, s in summary['per_depth'].items():
+        print(f"{d:5d}  {s['expands']:7d}  {s['assigns']:7d}  {s['backtracks']:10d}  "
+              f"{s['dead_ends']:9d}  {s['branching']:9.2f}")
+    print("\nhot cells (cell: assigns / backtracks)")
+    for cell, a, b in summary['hot_cells']:
+        print(f"  {cell}: {a} / {b}")
+    print("\nlargest wasted subtrees (cell = value at depth: nodes)")
+    for cell, v, d, size in summary['wasted_subtrees']:
+        print(f"  {cell} = {v} at depth {d}: {size}")
+
+def main():
+    if len(sys.argv) > 1:
+        trace = SearchTrace.load(sys.argv[1])
+    else:
+        N = 9
+        trace = SearchTrace(N)
+        BB_advancedsudoku4(generate_puzzle(N, 2), N, 'dac', trace=trace)
+    print_summary(summarize(trace))
+
+if __name__ == "__main__":
+    main()